@@ -0,0 +1,327 @@
+# Course:       CS261 - Data Structures
+# Description:  asyncio versions of the MinHeap based queues: a priority queue whose
+#               consumers await nodes instead of blocking the event loop, and a
+#               scheduler that keeps delayed callbacks in one heap ordered by
+#               deadline and sleeps only until the earliest one.
+
+
+import asyncio
+
+from dynamic_array import CircularDynamicArray
+from min_heap import *
+from priority_queue import PriorityQueueEmpty, PriorityQueueException, PriorityQueueFull
+
+
+class AsyncPriorityQueue:
+    """
+    MinHeap for coroutines of one event loop. get() hands out the smallest node and
+    suspends the caller while the queue is empty, and with a maxsize above 0 put()
+    suspends while it is full. task_done() and join() track whether every node that was
+    put has been processed, as for asyncio.Queue.
+    """
+
+    def __init__(self, maxsize: int = 0, arity: int = 2) -> None:
+        if maxsize < 0:
+            raise PriorityQueueException
+        self._maxsize = maxsize
+        self._heap = MinHeap(arity=arity)
+        # futures of suspended get() and put() calls, oldest first
+        self._getters = CircularDynamicArray()
+        self._putters = CircularDynamicArray()
+        self._unfinished = 0  # nodes put but not yet marked with task_done()
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    def __str__(self) -> str:
+        """
+        Return content of the queue in human-readable form
+        """
+        return "QUEUE " + str(self._heap)[len("HEAP "):]
+
+    async def put(self, node: object) -> None:
+        """
+        Adds a node, first waiting for room if the queue is full
+        """
+        while self.full():
+            putter = asyncio.get_running_loop().create_future()
+            self._putters.append(putter)
+            try:
+                await putter
+            except BaseException:
+                putter.cancel()
+                _discard(self._putters, putter)
+                # pass the room this putter was woken up for on to the next one
+                if not self.full() and not putter.cancelled():
+                    _wake_next(self._putters)
+                raise
+        self.put_nowait(node)
+
+    def put_nowait(self, node: object) -> None:
+        """
+        Adds a node, raising PriorityQueueFull if the queue is full
+        """
+        if self.full():
+            raise PriorityQueueFull
+        self._heap.add(node)
+        self._unfinished += 1
+        self._finished.clear()
+        _wake_next(self._getters)
+
+    async def get(self) -> object:
+        """
+        Removes and returns the smallest node, first waiting for one if the queue is empty
+        """
+        while self._heap.is_empty():
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                _discard(self._getters, getter)
+                if not self._heap.is_empty() and not getter.cancelled():
+                    _wake_next(self._getters)
+                raise
+        return self.get_nowait()
+
+    def get_nowait(self) -> object:
+        """
+        Removes and returns the smallest node, raising PriorityQueueEmpty if the queue is empty
+        """
+        if self._heap.is_empty():
+            raise PriorityQueueEmpty
+        node = self._heap.remove_min()
+        _wake_next(self._putters)
+        return node
+
+    def task_done(self) -> None:
+        """
+        Marks one node that was taken with get() as processed
+        """
+        if self._unfinished <= 0:
+            raise PriorityQueueException
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """
+        Waits until every node put so far has been marked with task_done()
+        """
+        if self._unfinished > 0:
+            await self._finished.wait()
+
+    def qsize(self) -> int:
+        """
+        Returns the number of nodes in the queue
+        """
+        return self._heap.size()
+
+    def empty(self) -> bool:
+        """
+        Returns True if the queue is empty
+        """
+        return self._heap.is_empty()
+
+    def full(self) -> bool:
+        """
+        Returns True if the queue is bounded and full
+        """
+        return self._maxsize > 0 and self._heap.size() >= self._maxsize
+
+    def get_maxsize(self) -> int:
+        """
+        Returns the capacity of the queue, 0 if it is unbounded
+        """
+        return self._maxsize
+
+
+def _wake_next(waiters: CircularDynamicArray) -> None:
+    """
+    Wakes up the oldest waiter that is still waiting
+    """
+    while not waiters.is_empty():
+        waiter = waiters.popleft()
+        if not waiter.done():
+            waiter.set_result(None)
+            return
+
+
+def _discard(waiters: CircularDynamicArray, waiter) -> None:
+    """
+    Removes a waiter that gave up, if it is still in the array
+    """
+    for index in range(waiters.length()):
+        if waiters[index] is waiter:
+            waiters.remove_at_index(index)
+            return
+
+
+class TimerHandle:
+    """
+    A callback scheduled with TimerScheduler
+    """
+
+    def __init__(self, deadline: float, callback, args: tuple) -> None:
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """
+        Keeps the callback from running. It stays in the heap until its deadline comes up.
+        """
+        self.cancelled = True
+
+
+class TimerScheduler:
+    """
+    Runs callbacks after a delay, like loop.call_later(), but keeps all of them in one
+    MinHeap keyed by deadline, with callbacks that have the same deadline running in the
+    order they were scheduled. One background task sleeps until the earliest deadline,
+    runs every callback that is due, and goes back to sleep, so the event loop has a
+    single timer however many callbacks are waiting. Callbacks that return a coroutine
+    have it scheduled as a task. Must be used from inside a running event loop.
+    """
+
+    def __init__(self) -> None:
+        self._heap = MinHeap()
+        self._order = 0  # scheduling counter, breaks ties between equal deadlines
+        self._runner = None  # background task, running while there are callbacks
+        self._waiter = None  # future the runner sleeps on until the earliest deadline
+        self._tasks = set()  # tasks created for coroutine callbacks, kept until they finish
+
+    def call_later(self, delay: float, callback, *args) -> TimerHandle:
+        """
+        Schedules callback(*args) to run in delay seconds
+        """
+        return self.call_at(asyncio.get_running_loop().time() + delay, callback, *args)
+
+    def call_at(self, deadline: float, callback, *args) -> TimerHandle:
+        """
+        Schedules callback(*args) to run at deadline, in the event loop's time()
+        """
+        handle = TimerHandle(deadline, callback, args)
+        # heap entries are (deadline, order, handle) tuples, which compare without calling
+        # back into Python and never get as far as comparing handles, as order is unique
+        entry = (deadline, self._order, handle)
+        self._order += 1
+        earliest = self._heap.is_empty() or entry < self._heap.get_min()
+        self._heap.add(entry)
+
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.get_running_loop().create_task(self._run())
+        elif earliest and self._waiter is not None and not self._waiter.done():
+            # the runner is sleeping until a later deadline, wake it up to sleep less
+            self._waiter.set_result(None)
+        return handle
+
+    def pending(self) -> int:
+        """
+        Returns the number of callbacks that haven't run yet, including cancelled ones
+        whose deadline hasn't come up
+        """
+        return self._heap.size()
+
+    def close(self) -> None:
+        """
+        Drops every callback that hasn't run and stops the background task
+        """
+        self._heap.clear()
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+
+    async def _run(self) -> None:
+        """
+        Sleeps until the earliest deadline and runs the callbacks that are due, until the heap is empty
+        """
+        loop = asyncio.get_running_loop()
+        while not self._heap.is_empty():
+            deadline = self._heap.get_min()[0]
+            if deadline > loop.time():
+                self._waiter = loop.create_future()
+                timer = loop.call_at(deadline, _wake, self._waiter)
+                try:
+                    await self._waiter
+                finally:
+                    timer.cancel()
+                    self._waiter = None
+                continue
+
+            # run everything that is due now
+            now = loop.time()
+            while not self._heap.is_empty() and self._heap.get_min()[0] <= now:
+                handle = self._heap.remove_min()[2]
+                if not handle.cancelled:
+                    self._call(loop, handle)
+
+    def _call(self, loop, handle: TimerHandle) -> None:
+        """
+        Runs one callback, reporting exceptions to the loop's exception handler
+        """
+        try:
+            result = handle.callback(*handle.args)
+            if asyncio.iscoroutine(result):
+                task = loop.create_task(result)
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except Exception as exception:
+            loop.call_exception_handler({"message": "Exception in TimerScheduler callback",
+                                         "exception": exception, "handle": handle})
+
+
+def _wake(waiter) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+if __name__ == '__main__':
+
+    async def queue_example():
+        print("\nAsyncPriorityQueue example 1")
+        print("----------------------------")
+        q = AsyncPriorityQueue(maxsize=3)
+        order = DynamicArray()
+
+        async def worker():
+            while True:
+                value = await q.get()
+                order.append(value)
+                q.task_done()
+
+        task = asyncio.get_running_loop().create_task(worker())
+        for value in [5, 1, 4, 2, 3, 0]:
+            await q.put(value)
+        await q.join()
+        task.cancel()
+        print(order, q.empty())
+
+        print("\nAsyncPriorityQueue example 2")
+        print("----------------------------")
+        q = AsyncPriorityQueue()
+        try:
+            await asyncio.wait_for(q.get(), 0.01)
+        except asyncio.TimeoutError:
+            print("nothing to get after 0.01 seconds")
+        q.put_nowait((2, 'b'))
+        q.put_nowait((1, 'a'))
+        print(q)
+        print(await q.get(), q.get_nowait())
+
+    async def scheduler_example():
+        print("\nTimerScheduler example 1")
+        print("------------------------")
+        scheduler = TimerScheduler()
+        fired = DynamicArray()
+        for delay in [0.03, 0.01, 0.02, 0.01]:
+            scheduler.call_later(delay, fired.append, delay)
+        handle = scheduler.call_later(0.015, fired.append, "cancelled")
+        handle.cancel()
+        print(scheduler.pending())
+        await asyncio.sleep(0.05)
+        print(fired, scheduler.pending())
+
+    asyncio.run(queue_example())
+    asyncio.run(scheduler_example())
@@ -0,0 +1,928 @@
+# Course:       CS261 - Data Structures
+# Description:  Timing comparisons for the data structures in this repository.
+#               Run everything with `python benchmarks.py`, or pass the names of
+#               individual benchmarks, e.g. `python benchmarks.py heap_construction`.
+
+
+import asyncio
+import operator
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+import dynamic_array
+from async_queue import *
+from blocked_array import *
+from dynamic_array import *
+from min_heap import *
+from priority_queue import *
+from timer_wheel import *
+
+
+def _time(func, repeat: int = 3) -> float:
+    """
+    Returns the best wall clock time (in seconds) out of several runs of func
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def _report(label: str, seconds: float, baseline: float = None) -> None:
+    """
+    Prints one line of benchmark output, with the speedup over a baseline if given
+    """
+    line = f"  {label:<40} {seconds * 1000:10.2f} ms"
+    if baseline is not None:
+        line += f"  ({baseline / seconds:5.2f}x)"
+    print(line)
+
+
+def bench_heap_construction(n: int = 100_000) -> None:
+    """
+    MinHeap(start_heap) and add_many() (linear heapify) against one add() per element
+    """
+    # descending input is the worst case for add(): every node percolates all the way up
+    for order, values in (("random", [random.random() for _ in range(n)]),
+                          ("descending", list(range(n, 0, -1)))):
+        print(f"\n# heap construction, {order} input, n = {n}")
+
+        def one_add_per_element():
+            h = MinHeap()
+            for value in values:
+                h.add(value)
+
+        baseline = _time(one_add_per_element)
+        _report("add() per element", baseline)
+        _report("MinHeap(start_heap)", _time(lambda: MinHeap(values)), baseline)
+        _report("add_many() in two halves", _time(lambda: _add_in_halves(values)), baseline)
+
+
+def _add_in_halves(values) -> None:
+    """
+    Loads a heap with two add_many() calls, so the second batch is heapified into a non-empty heap
+    """
+    h = MinHeap()
+    h.add_many(values[:len(values) // 2])
+    h.add_many(values[len(values) // 2:])
+
+
+def bench_heap_arity(n: int = 50_000) -> None:
+    """
+    Binary vs. wider d-ary heaps on push-heavy, pop-heavy and mixed workloads
+    """
+    arities = (2, 3, 4, 8)
+    values = [random.random() for _ in range(n)]
+
+    def push_heavy(arity):
+        # 9 adds for every remove_min
+        h = MinHeap(arity=arity)
+        for i, value in enumerate(values):
+            h.add(value)
+            if i % 10 == 9:
+                h.remove_min()
+
+    def pop_heavy(arity):
+        # build once, then drain
+        h = MinHeap(values, arity)
+        while not h.is_empty():
+            h.remove_min()
+
+    def mixed(arity):
+        # half adds, half removes, around a heap of n / 2 items
+        h = MinHeap(values[:n // 2], arity)
+        for i, value in enumerate(values[n // 2:]):
+            h.add(value)
+            h.remove_min()
+
+    def sort(arity):
+        heapsort(DynamicArray(values), arity)
+
+    # heapsort() would sort these floats with NumPy, ignoring arity
+    numpy = dynamic_array.np
+    dynamic_array.np = None
+    try:
+        for name, workload in (("push-heavy", push_heavy), ("pop-heavy", pop_heavy),
+                               ("mixed", mixed), ("heapsort", sort)):
+            print(f"\n# {name} workload by arity, n = {n}")
+            timings = {}
+            for arity in arities:
+                timings[arity] = _time(lambda: workload(arity), 1)
+                _report(f"arity {arity}", timings[arity], timings[arities[0]])
+            print(f"  winner: arity {min(timings, key=timings.get)}")
+    finally:
+        dynamic_array.np = numpy
+
+
+def bench_heap_churn(n: int = 50_000, steps: int = 100_000) -> None:
+    """
+    Steady-state priority queue churn: remove_min() + add() against replace()
+    """
+    print(f"\n# heap churn, heap of {n}, {steps} steps")
+    values = [random.random() for _ in range(n)]
+    new_values = [random.random() for _ in range(steps)]
+
+    def remove_then_add():
+        h = MinHeap(values)
+        for value in new_values:
+            h.remove_min()
+            h.add(value)
+
+    def replace():
+        h = MinHeap(values)
+        for value in new_values:
+            h.replace(value)
+
+    def pushpop():
+        h = MinHeap(values)
+        for value in new_values:
+            h.pushpop(value)
+
+    baseline = _time(remove_then_add, 1)
+    _report("remove_min() + add()", baseline)
+    _report("replace()", _time(replace, 1), baseline)
+    _report("pushpop()", _time(pushpop, 1), baseline)
+
+
+def bench_top_k(n: int = 200_000, k: int = 100) -> None:
+    """
+    nsmallest() over a generator against loading everything into a DynamicArray and heapsorting it
+    """
+    print(f"\n# {k} smallest of {n} streamed values")
+    values = [random.random() for _ in range(n)]
+
+    def load_and_sort():
+        da = DynamicArray(values)
+        heapsort(da)
+        return da.slice(n - k, k)
+
+    baseline = _time(load_and_sort, 1)
+    _report("DynamicArray + heapsort()", baseline)
+    _report("nsmallest()", _time(lambda: nsmallest(k, (value for value in values)), 1), baseline)
+
+
+def bench_merge(shards: int = 8, shard_size: int = 25_000) -> None:
+    """
+    merge() of sorted shards against concatenating them and heapsorting the result
+    """
+    print(f"\n# merging {shards} sorted shards of {shard_size}")
+    arrays = [DynamicArray(sorted(random.random() for _ in range(shard_size))) for _ in range(shards)]
+
+    def concatenate_and_sort():
+        da = DynamicArray()
+        for arr in arrays:
+            for value in arr:
+                da.append(value)
+        heapsort(da)
+
+    def first_ten():
+        stream = merge(*arrays)
+        return [next(stream) for _ in range(10)]
+
+    baseline = _time(concatenate_and_sort, 1)
+    _report("concatenate + heapsort()", baseline)
+    _report("merge(), fully consumed", _time(lambda: sum(1 for _ in merge(*arrays)), 1), baseline)
+    _report("merge(), first 10 items", _time(first_ten, 1), baseline)
+
+
+def bench_run_sort(n: int = 50_000) -> None:
+    """
+    run_sort() against heapsort() on sorted, reversed, random, few-unique and nearly sorted input
+    """
+    nearly_sorted = list(range(n))
+    for _ in range(n // 100):
+        i, j = random.randrange(n), random.randrange(n)
+        nearly_sorted[i], nearly_sorted[j] = nearly_sorted[j], nearly_sorted[i]
+    inputs = (
+        ("sorted", list(range(n))),
+        ("reversed", list(range(n, 0, -1))),
+        ("random", [random.random() for _ in range(n)]),
+        ("few unique", [random.randrange(4) for _ in range(n)]),
+        ("nearly sorted", nearly_sorted),
+    )
+    # compare against the heap itself, not heapsort()'s NumPy path
+    numpy = dynamic_array.np
+    dynamic_array.np = None
+    try:
+        for name, values in inputs:
+            print(f"\n# {name} input, n = {n}")
+            baseline = _time(lambda: heapsort(DynamicArray(values)), 1)
+            _report("heapsort()", baseline)
+            _report("run_sort()", _time(lambda: run_sort(DynamicArray(values)), 1), baseline)
+    finally:
+        dynamic_array.np = numpy
+
+
+def bench_parallel_sort(n: int = 200_000) -> None:
+    """
+    parallel_sort() with an increasing number of worker processes against serial run_sort()
+    """
+    print(f"\n# parallel sort, random input, n = {n}, {os.cpu_count()} CPUs")
+    values = [random.random() for _ in range(n)]
+    baseline = _time(lambda: run_sort(DynamicArray(values)), 1)
+    _report("run_sort()", baseline)
+    for workers in (2, 4, 8):
+        _report(f"parallel_sort(workers={workers})",
+                _time(lambda: parallel_sort(DynamicArray(values), workers), 1), baseline)
+
+
+def bench_lazy_pipeline(n: int = 200_000) -> None:
+    """
+    Eager map().filter().reduce() against the fused lazy() pipeline
+    """
+    print(f"\n# map / filter / reduce pipeline, n = {n}")
+    da = DynamicArray(range(n))
+
+    def square(x):
+        return x * x
+
+    def is_even(x):
+        return x % 2 == 0
+
+    def add(x, y):
+        return x + y
+
+    baseline = _time(lambda: da.map(square).filter(is_even).reduce(add), 1)
+    _report("map().filter().reduce()", baseline)
+    _report("lazy().map().filter().reduce()",
+            _time(lambda: da.lazy().map(square).filter(is_even).reduce(add), 1), baseline)
+    baseline = _time(lambda: da.map(square), 1)
+    _report("map()", baseline)
+    _report("lazy().map().collect()", _time(lambda: da.lazy().map(square).collect(), 1), baseline)
+
+
+def _cpu_heavy(x: int) -> int:
+    """
+    Deliberately slow map function for bench_parallel_map_reduce()
+    """
+    total = 0
+    for i in range(200):
+        total += (x * i) % 7
+    return total
+
+
+def _add(x, y):
+    return x + y
+
+
+def bench_parallel_map_reduce(n: int = 50_000) -> None:
+    """
+    parallel_map() / parallel_reduce() with a CPU-heavy map function against map() / reduce()
+    """
+    print(f"\n# parallel map and reduce, n = {n}, {os.cpu_count()} CPUs")
+    da = DynamicArray(range(n))
+    baseline = _time(lambda: da.map(_cpu_heavy).reduce(_add), 1)
+    _report("map().reduce()", baseline)
+    for workers in (2, 4):
+        _report(f"parallel_map/reduce, {workers} workers",
+                _time(lambda: da.parallel_map(_cpu_heavy, workers).parallel_reduce(_add, workers=workers), 1),
+                baseline)
+
+
+def bench_typed_storage(n: int = 200_000) -> None:
+    """
+    Memory per element of list-backed vs. typed DynamicArrays holding floats and ints,
+    plus the time to append them
+    """
+    for name, typecode, make_value in (("floats", 'd', float), ("ints", 'q', int)):
+        print(f"\n# {n} {name}")
+        for label, code in (("list-backed", None), (f"typecode='{typecode}'", typecode)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            da = DynamicArray(typecode=code)
+            for i in range(n):
+                # large values so small ints aren't shared with the interpreter's cache
+                da.append(make_value(i * 1000))
+            elapsed = time.perf_counter() - start
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            _report(f"{label}, {memory / n:5.1f} bytes/element", elapsed)
+            del da
+
+
+def bench_numpy(n: int = 200_000) -> None:
+    """
+    map / filter / reduce / heapsort on float arrays, with and without the NumPy fast path
+    """
+    if dynamic_array.np is None:
+        print("\n# NumPy is not installed, skipping")
+        return
+    values = [random.uniform(-1, 1) for _ in range(n)]
+    # only ufuncs take the fast path, other functions are called once per element
+    square, signbit, add = dynamic_array.np.square, dynamic_array.np.signbit, dynamic_array.np.add
+    operations = (
+        ("map(np.square)", lambda da: da.map(square)),
+        ("filter(np.signbit)", lambda da: da.filter(signbit)),
+        ("reduce(np.add)", lambda da: da.reduce(add)),
+        ("heapsort()", heapsort),
+    )
+    for label, typecode in (("list-backed", None), ("typecode='d'", 'd')):
+        print(f"\n# {label} floats, n = {n}")
+        source = DynamicArray(values, typecode)
+        for name, operation in operations:
+            # heapsort() sorts in place, so every run gets its own copy
+            run = lambda: operation(source.slice(0, n) if operation is heapsort else source)
+            numpy = dynamic_array.np
+            dynamic_array.np = None
+            try:
+                baseline = _time(run, 1)
+            finally:
+                dynamic_array.np = numpy
+            _report(f"{name}, Python", baseline)
+            _report(f"{name}, NumPy", _time(run, 1), baseline)
+
+
+def bench_views(n: int = 200_000) -> None:
+    """
+    slice() copies against view() windows, and build_heap() on input that is already a heap
+    """
+    print(f"\n# slices and views, n = {n}")
+    da = DynamicArray(range(n))
+    baseline = _time(lambda: da.slice(0, n // 2), 1)
+    _report("slice(0, n / 2)", baseline)
+    _report("view(0, n / 2)", _time(lambda: da.view(0, n // 2), 1), baseline)
+    baseline = _time(lambda: da.slice(0, n // 2).reduce(max), 1)
+    _report("slice(0, n / 2).reduce(max)", baseline)
+    _report("view(0, n / 2).reduce(max)", _time(lambda: da.view(0, n // 2).reduce(max), 1), baseline)
+    # sorted input is already a min heap, so copy-on-write build_heap() never copies it
+    baseline = _time(lambda: heapify(da.slice(0, n)), 1)
+    _report("slice() + heapify(), sorted array", baseline)
+    _report("build_heap(), sorted array", _time(lambda: MinHeap().build_heap(da), 1), baseline)
+
+
+def bench_bulk_load(n: int = 500_000) -> None:
+    """
+    Loading n values with append() against the extend()-based constructor and reserve()
+    """
+    print(f"\n# loading {n} values")
+    values = list(range(n))
+
+    def append_each():
+        da = DynamicArray()
+        for value in values:
+            da.append(value)
+
+    def reserve_then_append():
+        da = DynamicArray()
+        da.reserve(n)
+        for value in values:
+            da.append(value)
+
+    baseline = _time(append_each, 1)
+    _report("append() per value", baseline)
+    _report("reserve() + append() per value", _time(reserve_then_append, 1), baseline)
+    _report("DynamicArray(values)", _time(lambda: DynamicArray(values), 1), baseline)
+    _report("DynamicArray(generator)", _time(lambda: DynamicArray(value for value in values), 1), baseline)
+
+
+def bench_resize_policy(n: int = 1024, rounds: int = 500) -> None:
+    """
+    Replays one workload that oscillates around the resize thresholds under several resize
+    policies and reports the resizes and element copies each performed
+    """
+    print(f"\n# {rounds} rounds of removes then appends starting at size {n}")
+    # the same seeded swings for every policy: remove that many values off the end, then append them back
+    rng = random.Random(16)
+    swings = [rng.randint(1, n) for _ in range(rounds)]
+    policies = {
+        "default": DEFAULT_POLICY,
+        "shrink at 1/8, to 4x size": ResizePolicy(shrink_ratio=8, shrink_headroom=4),
+        "grow by 1.5x": ResizePolicy(growth_factor=1.5),
+        "never shrink": NEVER_SHRINK,
+    }
+    baseline = None
+    for label, policy in policies.items():
+        da = DynamicArray(range(n), policy=policy)
+        start_resizes, start_copies = da.get_resize_stats()
+
+        def replay():
+            for swing in swings:
+                for _ in range(swing):
+                    da.remove_at_index(da.length() - 1)
+                for _ in range(swing):
+                    da.append(0)
+
+        seconds = _time(replay, 1)
+        resizes, copies = da.get_resize_stats()
+        _report(f"{label}: {resizes - start_resizes} resizes, {copies - start_copies} copies", seconds, baseline)
+        if baseline is None:
+            baseline = seconds
+
+
+def bench_queue(n: int = 2_000) -> None:
+    """
+    FIFO queue and stack throughput: the generic remove_at_index() path against pop(),
+    and a plain DynamicArray against a CircularDynamicArray
+    """
+    print(f"\n# queue of {n} values")
+
+    def remove_front():
+        da = DynamicArray(range(n))
+        while not da.is_empty():
+            da.append(da[0])
+            da.remove_at_index(0)
+            da.remove_at_index(0)
+
+    def popleft():
+        da = CircularDynamicArray(range(n))
+        while not da.is_empty():
+            da.append(da.popleft())
+            da.popleft()
+
+    baseline = _time(remove_front, 1)
+    _report("DynamicArray append() + remove_at_index(0)", baseline)
+    _report("CircularDynamicArray append() + popleft()", _time(popleft, 1), baseline)
+
+    print(f"\n# stack of {n * 10} values")
+
+    def remove_last():
+        da = DynamicArray(range(n * 10))
+        while not da.is_empty():
+            da.remove_at_index(da.length() - 1)
+
+    def pop():
+        da = DynamicArray(range(n * 10))
+        while not da.is_empty():
+            da.pop()
+
+    baseline = _time(remove_last, 1)
+    _report("remove_at_index(length - 1)", baseline)
+    _report("pop()", _time(pop, 1), baseline)
+
+
+def bench_blocked(n: int = 100_000, edits: int = 100) -> None:
+    """
+    Inserting and removing at random indices of a DynamicArray against a BlockedDynamicArray,
+    and what the blocks cost for reading the array in order and at random
+    """
+    print(f"\n# {edits} inserts and {edits} removes at random indices of {n} values")
+    indices = [random.randrange(n) for _ in range(edits)]
+    arrays = {"DynamicArray": DynamicArray(range(n)), "BlockedDynamicArray": BlockedDynamicArray(range(n))}
+
+    def edit(da):
+        for index in indices:
+            da.insert_at_index(index, -1)
+        for index in indices:
+            da.remove_at_index(index)
+
+    baseline = None
+    for label, da in arrays.items():
+        seconds = _time(lambda: edit(da), 1)
+        _report(label, seconds, baseline)
+        baseline = baseline or seconds
+
+    print(f"\n# reading {n} values")
+    for order, read_indices in [("in order", range(n)), ("at random", [random.randrange(n) for _ in range(n)])]:
+        baseline = None
+        for label, da in arrays.items():
+            seconds = _time(lambda: [da[i] for i in read_indices], 1)
+            _report(f"{label}, {order}", seconds, baseline)
+            baseline = baseline or seconds
+
+
+class _IndexIterationArray(DynamicArray):
+    """
+    DynamicArray iterated the way it used to be: the array is its own iterator and
+    __next__ indexes until get_at_index() raises
+    """
+
+    def __iter__(self):
+        self._index = 0
+        return self
+
+    def __next__(self):
+        try:
+            value = self[self._index]
+        except DynamicArrayException:
+            raise StopIteration
+        self._index += 1
+        return value
+
+
+def bench_iteration(n: int = 500_000) -> None:
+    """
+    for x in da with the old self-iterating protocol against the iterator objects,
+    for each kind of array
+    """
+    print(f"\n# iterating over {n} values")
+    values = list(range(n))
+
+    def loop(da):
+        for _ in da:
+            pass
+
+    def reversed_loop(da):
+        for _ in reversed(da):
+            pass
+
+    baseline = _time(lambda: loop(_IndexIterationArray(values)), 1)
+    _report("self-iterating DynamicArray", baseline)
+    arrays = {
+        "DynamicArray": DynamicArray(values),
+        "typed DynamicArray": DynamicArray(values, 'q'),
+        "CircularDynamicArray": CircularDynamicArray(values),
+        "BlockedDynamicArray": BlockedDynamicArray(values),
+        "DynamicArrayView": DynamicArray(values).view(0, n),
+    }
+    for label, da in arrays.items():
+        _report(label, _time(lambda: loop(da), 1), baseline)
+    _report("reversed(DynamicArray)", _time(lambda: reversed_loop(arrays["DynamicArray"]), 1), baseline)
+
+
+def _checked_percolate_down(da: DynamicArray, node_index: int, max_index: int) -> None:
+    """
+    percolate_down() the way it used to be, reading and writing through the bounds-checked
+    get_at_index() / set_at_index()
+    """
+    max_index = min(max_index, da.length() - 1)
+    while True:
+        first_child_index = node_index * 2 + 1
+        if first_child_index > max_index:
+            return
+        favorite_child = da.get_at_index(first_child_index)
+        fav_child_index = first_child_index
+        if first_child_index + 1 <= max_index and da.get_at_index(first_child_index + 1) < favorite_child:
+            favorite_child = da.get_at_index(first_child_index + 1)
+            fav_child_index = first_child_index + 1
+        node = da.get_at_index(node_index)
+        if not favorite_child < node:
+            return
+        da[node_index] = favorite_child
+        da[fav_child_index] = node
+        node_index = fav_child_index
+
+
+def _checked_heapify(da: DynamicArray) -> None:
+    for node_index in range((da.length() - 2) // 2, -1, -1):
+        _checked_percolate_down(da, node_index, da.length() - 1)
+
+
+def _checked_heapsort(da: DynamicArray) -> None:
+    _checked_heapify(da)
+    for counter in range(da.length() - 1, 0, -1):
+        swap(da, 0, counter)
+        _checked_percolate_down(da, 0, counter - 1)
+
+
+def bench_unchecked(n: int = 100_000) -> None:
+    """
+    heapsort() and build_heap() on the unchecked access path against the same algorithms
+    going through the bounds-checked public API, with NumPy switched off
+    """
+    print(f"\n# {n} random floats")
+    values = [random.random() for _ in range(n)]
+    cases = (
+        ("heapsort()", None, _checked_heapsort, heapsort),
+        ("build_heap()", None, _checked_heapify, lambda da: MinHeap().build_heap(da)),
+        ("heapsort(), typecode='d'", 'd', _checked_heapsort, heapsort),
+    )
+    numpy = dynamic_array.np
+    dynamic_array.np = None
+    try:
+        for label, typecode, checked, unchecked in cases:
+            # time only the algorithm, on a fresh array each
+            da = DynamicArray(values, typecode)
+            baseline = _time(lambda: checked(da), 1)
+            _report(f"{label}, checked access", baseline)
+            da = DynamicArray(values, typecode)
+            _report(f"{label}, unchecked access", _time(lambda: unchecked(da), 1), baseline)
+    finally:
+        dynamic_array.np = numpy
+
+
+def _run_threads(producer, consumer, producers: int, consumers: int) -> None:
+    """
+    Starts producer(i) for i < producers and consumer() consumers times, and waits for all of them
+    """
+    threads = [threading.Thread(target=producer, args=(i,)) for i in range(producers)]
+    threads += [threading.Thread(target=consumer) for _ in range(consumers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def bench_priority_queue(n: int = 100_000, producers: int = 4, consumers: int = 4) -> None:
+    """
+    Pushing n values through a MinHeap from several producer threads to several consumer
+    threads: a lock around the heap with consumers polling it, against BlockingPriorityQueue
+    """
+    print(f"\n# {n} values, {producers} producer and {consumers} consumer threads")
+    values = [random.random() for _ in range(n)]
+    per_consumer = n // consumers
+
+    def locked_heap():
+        heap = MinHeap()
+        lock = threading.Lock()
+
+        def produce(i):
+            for value in values[i::producers]:
+                with lock:
+                    heap.add(value)
+
+        def consume():
+            taken = 0
+            while taken < per_consumer:
+                with lock:
+                    if not heap.is_empty():
+                        heap.remove_min()
+                        taken += 1
+                        continue
+                time.sleep(0.0001)
+
+        _run_threads(produce, consume, producers, consumers)
+
+    def blocking_queue(maxsize=0, batch=1):
+        q = BlockingPriorityQueue(maxsize)
+
+        def produce(i):
+            for value in values[i::producers]:
+                q.put(value)
+
+        def consume():
+            taken = 0
+            while taken < per_consumer:
+                if batch == 1:
+                    q.get()
+                    taken += 1
+                else:
+                    taken += q.get_many(min(batch, per_consumer - taken)).length()
+
+        return lambda: _run_threads(produce, consume, producers, consumers)
+
+    baseline = _time(locked_heap, 1)
+    _report("Lock + MinHeap, polling consumers", baseline)
+    _report("BlockingPriorityQueue get()", _time(blocking_queue(), 1), baseline)
+    _report("BlockingPriorityQueue get_many(64)", _time(blocking_queue(batch=64), 1), baseline)
+    _report("BlockingPriorityQueue(maxsize=1000) get()", _time(blocking_queue(1000), 1), baseline)
+    _report("BlockingPriorityQueue(maxsize=1000) get_many(64)", _time(blocking_queue(1000, 64), 1), baseline)
+
+
+def bench_async(n: int = 50_000, timers: int = 20_000) -> None:
+    """
+    asyncio.PriorityQueue against AsyncPriorityQueue with producer and consumer coroutines,
+    and delayed callbacks as one task or one loop timer each against one TimerScheduler
+    """
+    print(f"\n# {n} values, 4 producer and 4 consumer coroutines")
+    values = [random.random() for _ in range(n)]
+
+    async def pipe(q):
+        async def produce(i):
+            for value in values[i::4]:
+                await q.put(value)
+
+        async def consume(i):
+            # as many as producer i puts, so the consumers take exactly n values between them
+            for _ in range(len(values[i::4])):
+                await q.get()
+                q.task_done()
+
+        await asyncio.gather(*[produce(i) for i in range(4)], *[consume(i) for i in range(4)])
+        await q.join()
+
+    for maxsize in (0, 100):
+        baseline = _time(lambda: asyncio.run(pipe(asyncio.PriorityQueue(maxsize))), 1)
+        _report(f"asyncio.PriorityQueue({maxsize})", baseline)
+        _report(f"AsyncPriorityQueue({maxsize})", _time(lambda: asyncio.run(pipe(AsyncPriorityQueue(maxsize))), 1),
+                baseline)
+
+    delays = [random.uniform(0, 0.1) for _ in range(timers)]
+    print(f"\n# {timers} callbacks delayed by 0 to 0.1 seconds, time until all ran")
+
+    async def run_timers(schedule):
+        done = asyncio.get_running_loop().create_future()
+        remaining = [timers]
+
+        def callback():
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done.set_result(None)
+
+        for delay in delays:
+            schedule(delay, callback)
+        await done
+
+    async def task_per_callback(delay, callback):
+        await asyncio.sleep(delay)
+        callback()
+
+    tasks = set()
+
+    def with_tasks(delay, callback):
+        task = asyncio.get_running_loop().create_task(task_per_callback(delay, callback))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    def with_call_later(delay, callback):
+        asyncio.get_running_loop().call_later(delay, callback)
+
+    async def run_scheduler():
+        await run_timers(TimerScheduler().call_later)
+
+    baseline = None
+    for label, run in (("one sleeping task per callback", lambda: asyncio.run(run_timers(with_tasks))),
+                       ("loop.call_later() per callback", lambda: asyncio.run(run_timers(with_call_later))),
+                       ("TimerScheduler", lambda: asyncio.run(run_scheduler()))):
+        seconds = _time(run, 1)
+        # run again to measure memory, tracing slows everything down
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        _report(f"{label}, peak {peak / 2 ** 20:4.1f} MiB", seconds, baseline)
+        baseline = baseline or seconds
+
+
+def bench_timer_wheel(n: int = 1_000_000, cancel_rate: float = 0.9, horizon: int = 30_000) -> None:
+    """
+    n timeouts spread over horizon ticks, most of them cancelled before they fire, in a
+    MinHeap with cancelled entries marked and skipped against a TimerWheel
+    """
+    print(f"\n# {n} timers over {horizon} ticks, {cancel_rate:.0%} cancelled")
+    deadlines = [random.randint(1, horizon) for _ in range(n)]
+    cancelled = [random.random() < cancel_rate for _ in range(n)]
+
+    def heap_timers():
+        heap = MinHeap()
+        timers = [None] * n
+        for i in range(n):
+            # [deadline, order, cancelled], a list so the flag can be set in place
+            timers[i] = [deadlines[i], i, False]
+            heap.add(timers[i])
+        for i in range(n):
+            if cancelled[i]:
+                timers[i][2] = True
+        fired = 0
+        for now in range(1, horizon + 1):
+            while not heap.is_empty() and heap.get_min()[0] <= now:
+                if not heap.remove_min()[2]:
+                    fired += 1
+        return fired
+
+    def wheel_timers():
+        wheel = TimerWheel()
+        timers = [None] * n
+        for i in range(n):
+            timers[i] = wheel.schedule(deadlines[i], i)
+        for i in range(n):
+            if cancelled[i]:
+                wheel.cancel(timers[i])
+        fired = 0
+        for _ in range(horizon):
+            fired += wheel.advance().length()
+        return fired
+
+    baseline = _time(heap_timers, 1)
+    _report("MinHeap, cancelled entries skipped", baseline)
+    _report("TimerWheel", _time(wheel_timers, 1), baseline)
+
+
+def _take_queued(queued: list, where: dict, entry_id: int) -> None:
+    """
+    Removes an id from queued in O(1) by moving the last id into its place
+    """
+    index = where.pop(entry_id)
+    last_id = queued.pop()
+    if last_id != entry_id:
+        queued[index] = last_id
+        where[last_id] = index
+
+
+def bench_discard(steps: int = 200_000, live: int = 1_000) -> None:
+    """
+    A queue of about live entries where every step adds two entries, removes a random queued
+    one and takes the smallest, with removed entries marked and skipped against discard()
+    """
+    print(f"\n# {steps} steps, about {live} live entries")
+    priorities = [random.random() for _ in range(2 * steps + live)]
+    picks = [random.random() for _ in range(steps)]
+
+    def run(use_discard):
+        heap = MinHeap((priorities[i], i) for i in range(live))
+        queued = list(range(live))  # ids still in the queue, to pick the ones to remove from
+        where = {i: i for i in range(live)}  # id -> index in queued
+        removed = set()  # ids marked as removed but still in the heap
+        next_id = live
+        largest = live
+        for step in range(steps):
+            for _ in range(2):
+                heap.add((priorities[next_id], next_id))
+                where[next_id] = len(queued)
+                queued.append(next_id)
+                next_id += 1
+
+            entry_id = queued[int(picks[step] * len(queued))]
+            _take_queued(queued, where, entry_id)
+            if use_discard:
+                heap.discard((priorities[entry_id], entry_id))
+            else:
+                removed.add(entry_id)
+                while heap.get_min()[1] in removed:
+                    removed.remove(heap.remove_min()[1])
+
+            _take_queued(queued, where, heap.remove_min()[1])
+            live_count, dead_count, _ = heap.get_tombstone_stats()
+            largest = max(largest, live_count + dead_count)
+        return largest
+
+    print(f"  heap array up to {run(False)} entries marked and skipped, {run(True)} with discard()")
+    baseline = _time(lambda: run(False), 1)
+    _report("marked and skipped", baseline)
+    _report("discard()", _time(lambda: run(True), 1), baseline)
+
+
+class _Job:
+    """
+    Item whose ordering is derived from its fields on every comparison, like a record
+    ordered by a computed priority
+    """
+
+    def __init__(self, weights: tuple) -> None:
+        self.weights = weights
+
+    def priority(self) -> float:
+        return sum(w * w for w in self.weights) / len(self.weights)
+
+    def __lt__(self, other: "_Job") -> bool:
+        return self.priority() < other.priority()
+
+
+def bench_key(n: int = 50_000) -> None:
+    """
+    Items with an expensive __lt__ in a MinHeap and heapsort(), compared directly, wrapped in
+    (priority, counter, item) tuples by the caller, and with key=
+    """
+    print(f"\n# {n} items ordered by a computed priority")
+    jobs = [_Job(tuple(random.random() for _ in range(8))) for _ in range(n)]
+
+    def compared():
+        h = MinHeap()
+        for job in jobs:
+            h.add(job)
+        while not h.is_empty():
+            h.remove_min()
+
+    def wrapped():
+        h = MinHeap()
+        for i, job in enumerate(jobs):
+            h.add((job.priority(), i, job))
+        while not h.is_empty():
+            h.remove_min()[2]
+
+    def keyed():
+        h = MinHeap(key=_Job.priority)
+        for job in jobs:
+            h.add(job)
+        while not h.is_empty():
+            h.remove_min()
+
+    baseline = _time(compared, 1)
+    _report("add() + remove_min(), __lt__", baseline)
+    _report("add() + remove_min(), tuples", _time(wrapped, 1), baseline)
+    _report("add() + remove_min(), key=", _time(keyed, 1), baseline)
+
+    baseline = _time(lambda: heapsort(DynamicArray(jobs)), 1)
+    _report("heapsort(), __lt__", baseline)
+    _report("heapsort(key=)", _time(lambda: heapsort(DynamicArray(jobs), key=_Job.priority), 1), baseline)
+
+
+BENCHMARKS = {
+    "heap_construction": bench_heap_construction,
+    "heap_arity": bench_heap_arity,
+    "heap_churn": bench_heap_churn,
+    "top_k": bench_top_k,
+    "merge": bench_merge,
+    "run_sort": bench_run_sort,
+    "parallel_sort": bench_parallel_sort,
+    "lazy_pipeline": bench_lazy_pipeline,
+    "parallel_map_reduce": bench_parallel_map_reduce,
+    "typed_storage": bench_typed_storage,
+    "numpy": bench_numpy,
+    "views": bench_views,
+    "bulk_load": bench_bulk_load,
+    "resize_policy": bench_resize_policy,
+    "queue": bench_queue,
+    "blocked": bench_blocked,
+    "iteration": bench_iteration,
+    "unchecked": bench_unchecked,
+    "priority_queue": bench_priority_queue,
+    "async": bench_async,
+    "timer_wheel": bench_timer_wheel,
+    "discard": bench_discard,
+    "key": bench_key,
+}
+
+
+if __name__ == "__main__":
+    random.seed(261)
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
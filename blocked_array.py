@@ -0,0 +1,417 @@
+# Course:       CS261 - Data Structures
+# Description:  Blocked list implementation of the dynamic array ADT. The elements are
+#               kept in a sequence of small DynamicArrays ("blocks"), so inserting or
+#               removing in the middle only shifts the elements of one block instead
+#               of everything after the index.
+
+
+import math
+
+from dynamic_array import *
+from dynamic_array import _unchecked
+
+
+# blocks are split once they reach twice the block size and merged with a neighbour once
+# they drop below half of it. Arrays pick a block size around the square root of their
+# length, which keeps both the per-block shifting and the per-block bookkeeping short, but
+# never below this: moving elements within a block is a fast slice copy, while updating
+# the blocks' start indices is a Python loop, so short arrays are better off with few blocks.
+BLOCK_SIZE = 1024
+
+
+class BlockedDynamicArray(DynamicArray):
+    """
+    DynamicArray split into blocks of about block_size elements. Indexing finds the block
+    by binary search over the blocks' start indices (sequential access reuses the last block
+    found, so loops over the array don't search at all), and insert_at_index() /
+    remove_at_index() shift the elements of one block and the start indices of the blocks
+    after it, O(block_size + n / block_size) instead of O(n).
+
+    Without a block_size the array picks its own, the square root of its length (at least
+    BLOCK_SIZE), making those O(sqrt(n)). Whenever the length has grown or shrunk by a factor
+    of four since the blocks were sized, they are regrouped to the new square root, O(n) but
+    rare enough to be O(1) amortized.
+
+    It can be used anywhere a DynamicArray can, including map(), filter(), reduce(), chunk()
+    and MinHeap. slice(), map() and filter() return plain DynamicArrays. Capacity is
+    managed per block, so resize() and reserve() do nothing.
+    """
+
+    def __init__(self, start_array=None, typecode: str = None, policy: ResizePolicy = None,
+                 block_size: int = None):
+        if block_size is not None and block_size < 2:
+            raise DynamicArrayException
+        self._size = 0
+        self._typecode = typecode
+        self._cow = None  # never set, copy_on_write() shares storage block by block instead
+        self._policy = DEFAULT_POLICY if policy is None else policy
+        self._resize_count = 0  # splits, merges and resizes of blocks that no longer exist
+        self._copy_count = 0  # elements copied by those
+        self._fixed_size = block_size is not None  # False if the block size follows the length
+        self._block_size = BLOCK_SIZE if block_size is None else block_size
+        self._blocks = DynamicArray()  # the blocks, in order, none of them empty
+        self._starts = DynamicArray(typecode='q')  # index of the first element of each block
+        self._last = 0  # block found by the last lookup
+        self._version = 0  # changes whenever elements move between indices, for iterators
+
+        if start_array is not None:
+            self.extend(start_array)
+
+    def __str__(self) -> str:
+        """
+        Return content of the array in human-readable form
+        """
+        out = "DYN_ARR Size/Cap: "
+        out += str(self._size) + "/" + str(self.get_capacity()) + ' ['
+        out += ', '.join([str(value) for block in self._blocks for value in block])
+        return out + ']'
+
+    def get_at_index(self, index: int) -> object:
+        """
+        Return value from given index position
+        Invalid index raises DynamicArrayException
+        """
+        if index < 0 or index >= self._size:
+            raise DynamicArrayException
+        block_index = self._find(index)
+        # the index was checked above, so read the blocks' StaticArrays directly
+        return self._blocks._data[block_index]._data[index - self._starts._data[block_index]]
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """
+        Store value at given index in the array
+        Invalid index raises DynamicArrayException
+        """
+        if index < 0 or index >= self._size:
+            raise DynamicArrayException
+        block_index = self._find(index)
+        self._blocks[block_index][index - self._starts[block_index]] = value
+
+    def __iter__(self):
+        index = 0
+        while index < self._size:
+            block_index = self._find(index)
+            block = self._blocks._data[block_index]
+            offset = index - self._starts._data[block_index]
+            # walk through the block until it ends or the array changes shape, after which
+            # the block holding index has to be found again
+            version = self._version
+            while offset < block.length() and version == self._version:
+                yield block._data[offset]
+                offset += 1
+                index += 1
+
+    def __reversed__(self):
+        index = self._size - 1
+        while index >= 0:
+            if index >= self._size:
+                index = self._size - 1
+                continue
+            block_index = self._find(index)
+            block = self._blocks._data[block_index]
+            offset = index - self._starts._data[block_index]
+            version = self._version
+            while offset >= 0 and version == self._version:
+                yield block._data[offset]
+                offset -= 1
+                index -= 1
+
+    def get_capacity(self) -> int:
+        """
+        Return the total capacity of the blocks
+        """
+        return sum(block.get_capacity() for block in self._blocks)
+
+    def get_resize_stats(self) -> tuple[int, int]:
+        """
+        Return the number of resizes, splits and merges so far and the number of elements they copied
+        """
+        resizes, copies = self._resize_count, self._copy_count
+        for block in self._blocks:
+            block_resizes, block_copies = block.get_resize_stats()
+            resizes += block_resizes
+            copies += block_copies
+        return resizes, copies
+
+    def print_da_variables(self) -> None:
+        """
+        Print information contained in the array
+        """
+        print(f"Length: {self._size}, Blocks: {self._blocks.length()}, Capacity: {self.get_capacity()}, "
+              f"Starts: {self._starts}")
+
+    def _find(self, index: int) -> int:
+        """
+        Return the number of the block holding a valid index
+        """
+        starts = self._starts._data
+        block_count = self._blocks.length()
+
+        # sequential access usually stays in the same block or moves to the next one
+        block_index = self._last
+        for _ in range(2):
+            if block_index < block_count:
+                start = starts[block_index]
+                if start <= index < start + self._blocks._data[block_index].length():
+                    self._last = block_index
+                    return block_index
+            block_index += 1
+
+        # binary search for the last block starting at or before index
+        low = 0
+        high = block_count - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if starts[mid] <= index:
+                low = mid
+            else:
+                high = mid - 1
+        self._last = low
+        return low
+
+    def _new_block(self) -> DynamicArray:
+        return DynamicArray(typecode=self._typecode, policy=self._policy)
+
+    def _shift_starts(self, first_block: int, delta: int) -> None:
+        """
+        Add delta to the start index of every block from first_block on
+        """
+        data, offset = self._starts._storage(for_writing=True)
+        for i in range(offset + first_block, offset + self._starts.length()):
+            data[i] += delta
+
+    def resize(self, new_capacity: int) -> None:
+        """
+        Does nothing, blocks resize themselves
+        """
+        return
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Does nothing, blocks resize themselves
+        """
+        return
+
+    def _make_room(self, count: int) -> None:
+        return
+
+    def shrink_to_fit(self) -> None:
+        """
+        Reduces the capacity of every block to its number of elements
+        """
+        for block in self._blocks:
+            block.shrink_to_fit()
+
+    def copy_on_write(self) -> "BlockedDynamicArray":
+        """
+        Return a copy of this array whose blocks are copy_on_write() copies of this array's
+        blocks, so copying is O(n / block_size) and writing to either array only copies the
+        block written to
+        """
+        new_da = BlockedDynamicArray(typecode=self._typecode, policy=self._policy,
+                                     block_size=self._block_size if self._fixed_size else None)
+        new_da._block_size = self._block_size
+        new_da._blocks._make_room(self._blocks.length())
+        for block in self._blocks:
+            new_da._blocks.append(block.copy_on_write())
+        new_da._starts = self._starts.copy_on_write()
+        new_da._size = self._size
+        return new_da
+
+    def _storage(self, for_writing: bool = False) -> tuple:
+        """
+        The elements aren't in one StaticArray, so there is no storage to return. Callers
+        such as the NumPy helpers fall back to indexing.
+        """
+        return None, 0
+
+    def append(self, value: object) -> None:
+        """
+        Adds new value onto the end of the last block, or a new block if it is full
+        """
+        block_count = self._blocks.length()
+        if block_count == 0 or self._blocks[block_count - 1].length() >= self._block_size:
+            self._blocks.append(self._new_block())
+            self._starts.append(self._size)
+            block_count += 1
+        self._blocks[block_count - 1].append(value)
+        self._size += 1
+        self._version += 1
+        self._fit_block_size()
+
+    def extend(self, values) -> None:
+        """
+        Appends every value of an iterable
+        """
+        if isinstance(values, DynamicArray):
+            # index instead of iterating, which also makes da.extend(da) safe
+            source = values
+            values = (source[i] for i in range(source.length()))
+        for value in values:
+            self.append(value)
+
+    def insert_at_index(self, index: int, value: object) -> None:
+        """
+        Add new value at desired index, shifting the values after it in the same block
+        """
+        if index > self._size or index < 0:
+            raise DynamicArrayException
+        if index == self._size:
+            self.append(value)
+            return
+
+        block_index = self._find(index)
+        block = self._blocks[block_index]
+        block.insert_at_index(index - self._starts[block_index], value)
+        self._shift_starts(block_index + 1, 1)
+        self._size += 1
+        self._version += 1
+        if block.length() >= 2 * self._block_size:
+            self._split(block_index)
+        self._fit_block_size()
+
+    def remove_at_index(self, index: int) -> None:
+        """
+        Removes desired item from the array, shifting the values after it in the same block
+        """
+        if index >= self._size or index < 0:
+            raise DynamicArrayException
+
+        block_index = self._find(index)
+        block = self._blocks[block_index]
+        block.remove_at_index(index - self._starts[block_index])
+        self._shift_starts(block_index + 1, -1)
+        self._size -= 1
+        self._version += 1
+        if block.is_empty():
+            self._drop(block_index)
+        elif block.length() < self._block_size // 2 and self._blocks.length() > 1:
+            # merge into the block before, or the one after if this is the first block
+            if block_index == 0:
+                block_index = 1
+            self._merge(block_index)
+        self._fit_block_size()
+
+    def pop(self) -> object:
+        """
+        Removes and returns the last value
+        """
+        if self._size == 0:
+            raise DynamicArrayException
+        block_index = self._blocks.length() - 1
+        block = self._blocks[block_index]
+        value = block.pop()
+        self._size -= 1
+        self._version += 1
+        if block.is_empty():
+            self._drop(block_index)
+        self._fit_block_size()
+        return value
+
+    def _fit_block_size(self) -> None:
+        """
+        Regroups the elements into blocks of the square root of the length (at least
+        BLOCK_SIZE) once the length is more than four times the square of the block size, or
+        less than a quarter of it. Does nothing for arrays created with a block_size.
+        """
+        if self._fixed_size:
+            return
+        block_size = self._block_size
+        if self._size <= 4 * block_size * block_size and (
+                block_size <= BLOCK_SIZE or 4 * self._size >= block_size * block_size):
+            return
+        self._regroup(max(BLOCK_SIZE, math.isqrt(self._size)))
+
+    def _regroup(self, block_size: int) -> None:
+        """
+        Copies the elements into new blocks of block_size elements each
+        """
+        # gather the elements with slice copies, then cut them into the new blocks
+        values = []
+        for old_block in self._blocks:
+            block_resizes, block_copies = old_block.get_resize_stats()
+            self._resize_count += block_resizes
+            self._copy_count += block_copies
+            items, offset = _unchecked(old_block)
+            values.extend(items[offset:offset + old_block.length()])
+
+        self._blocks = DynamicArray()
+        self._starts = DynamicArray(typecode='q')
+        self._block_size = block_size
+        for start in range(0, self._size, block_size):
+            block = self._new_block()
+            block.extend(values[start:start + block_size])
+            self._blocks.append(block)
+            self._starts.append(start)
+        self._resize_count += 1
+        self._copy_count += self._size
+        self._last = 0
+        self._version += 1
+
+    def _split(self, block_index: int) -> None:
+        """
+        Moves the second half of a block into a new block right after it
+        """
+        block = self._blocks[block_index]
+        half = block.length() // 2
+        new_block = block.slice(half, block.length() - half)
+        for _ in range(block.length() - half):
+            block.pop()
+        self._blocks.insert_at_index(block_index + 1, new_block)
+        self._starts.insert_at_index(block_index + 1, self._starts[block_index] + half)
+        self._resize_count += 1
+        self._copy_count += new_block.length()
+
+    def _merge(self, block_index: int) -> None:
+        """
+        Appends a block onto the block before it and removes it, splitting the result
+        again if it is too big
+        """
+        block = self._blocks[block_index]
+        self._blocks[block_index - 1].extend(block)
+        self._resize_count += 1
+        self._copy_count += block.length()
+        self._drop(block_index)
+        if self._blocks[block_index - 1].length() >= 2 * self._block_size:
+            self._split(block_index - 1)
+
+    def _drop(self, block_index: int) -> None:
+        """
+        Removes a block that is empty or whose elements were moved elsewhere
+        """
+        block_resizes, block_copies = self._blocks[block_index].get_resize_stats()
+        self._resize_count += block_resizes
+        self._copy_count += block_copies
+        if block_index == self._blocks.length() - 1:
+            self._blocks.pop()
+            self._starts.pop()
+        else:
+            self._blocks.remove_at_index(block_index)
+            self._starts.remove_at_index(block_index)
+        self._last = 0
+
+
+if __name__ == "__main__":
+
+    print("\n# blocked array example 1")
+    da = BlockedDynamicArray(range(10), block_size=4)
+    print(da)
+    da.print_da_variables()
+    da.insert_at_index(5, 100)
+    da.insert_at_index(5, 101)
+    da.insert_at_index(0, -1)
+    print(da)
+    da.print_da_variables()
+    for _ in range(5):
+        da.remove_at_index(3)
+    print(da)
+    da.print_da_variables()
+    print(da.pop(), da[0], da[da.length() - 1])
+
+    print("\n# blocked array example 2")
+    da = BlockedDynamicArray([3, 1, 4, 1, 5, 9, 2, 6, 5, 3], block_size=2)
+    print(da.map(lambda x: x * 2))
+    print(da.filter(lambda x: x % 2 == 1))
+    print(da.reduce(lambda x, y: x + y))
+    print([str(arr) for arr in chunk(da)])
+    print(da.copy_on_write(), da.view(2, 3))
@@ -6,8 +6,35 @@
 # Description: This is an implementation of the dynamic array ADT in Python.
 
 
+import operator
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 from static_array import StaticArray
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, without it everything runs as plain Python loops
+    np = None
+
+
+# parallel_map() and parallel_reduce() run in the calling process for arrays shorter than
+# this, where pickling the chunks would cost more than the extra cores save
+PARALLEL_CUTOFF = 10_000
+
+# map(), filter(), reduce() and heapsort() only try NumPy for arrays at least this long
+VECTORIZE_CUTOFF = 1_000
+
+# array module typecodes that NumPy can view directly
+_NUMERIC_TYPECODES = 'bBhHiIlLqQfd'
+
+# NumPy ufuncs that reduce() can hand to ufunc.reduce(), and whether they are safe on integers
+# (sums and products would silently wrap around at 64 bits). Only associative ones qualify,
+# as ufunc.reduce() is free to combine the elements in any grouping
+_ASSOCIATIVE_UFUNCS = {"add": False, "multiply": False, "maximum": True, "minimum": True,
+                       "fmax": True, "fmin": True}
+
 
 class DynamicArrayException(Exception):
     """
@@ -17,21 +44,77 @@ class DynamicArrayException(Exception):
     pass
 
 
+class ResizePolicy:
+    """
+    Decides how a DynamicArray grows when it is full and when it shrinks after removals.
+    The defaults are the classic behavior: double when full, and once size drops below
+    a quarter of a capacity above 10, shrink to twice the size (but not below 10).
+
+    growth_factor:   capacity multiplier when the array is full, must be greater than 1
+    shrink_ratio:    shrink once size * shrink_ratio < capacity, or None to never shrink
+    shrink_headroom: capacity after shrinking is size * shrink_headroom (at least 1), must be
+                     less than shrink_ratio. The gap between the two is the hysteresis that keeps
+                     an array whose size oscillates around the threshold from resizing back and forth
+    min_capacity:    the array never shrinks below this capacity
+    """
+
+    def __init__(self, growth_factor: float = 2, shrink_ratio: float = 4,
+                 shrink_headroom: float = 2, min_capacity: int = 10) -> None:
+        if growth_factor <= 1 or shrink_headroom < 1 or min_capacity < 1:
+            raise DynamicArrayException
+        if shrink_ratio is not None and shrink_ratio <= shrink_headroom:
+            raise DynamicArrayException
+        self.growth_factor = growth_factor
+        self.shrink_ratio = shrink_ratio
+        self.shrink_headroom = shrink_headroom
+        self.min_capacity = min_capacity
+
+    def grow(self, capacity: int) -> int:
+        """
+        Return the capacity to grow a full array of the given capacity to
+        """
+        return max(capacity + 1, int(capacity * self.growth_factor))
+
+    def shrink(self, size: int, capacity: int) -> int:
+        """
+        Return the capacity to shrink to before removing an element from an array of the given
+        size and capacity, or None if it should keep its capacity
+        """
+        if self.shrink_ratio is None or capacity <= self.min_capacity:
+            return None
+        if size * self.shrink_ratio < capacity:
+            return max(self.min_capacity, int(size * self.shrink_headroom))
+        return None
+
+    def __repr__(self) -> str:
+        return (f"ResizePolicy(growth_factor={self.growth_factor}, shrink_ratio={self.shrink_ratio}, "
+                f"shrink_headroom={self.shrink_headroom}, min_capacity={self.min_capacity})")
+
+
+DEFAULT_POLICY = ResizePolicy()
+NEVER_SHRINK = ResizePolicy(shrink_ratio=None)
+
+
 class DynamicArray:
-    def __init__(self, start_array=None):
+    def __init__(self, start_array=None, typecode: str = None, policy: ResizePolicy = None):
         """
-        Initialize new dynamic array
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Initialize new dynamic array. With an array module typecode the elements are
+        stored unboxed in a typed StaticArray and must all be of that type. policy
+        controls growing and shrinking, see ResizePolicy.
         """
         self._size = 0
         self._capacity = 4
-        self._data = StaticArray(self._capacity)
+        self._typecode = typecode
+        self._data = StaticArray(self._capacity, typecode)
+        self._cow = None  # _CowToken while self._data is shared through copy_on_write()
+        self._policy = DEFAULT_POLICY if policy is None else policy
+        self._resize_count = 0  # resizes so far
+        self._copy_count = 0  # elements copied by those resizes
 
         # populate dynamic array with initial values (if provided)
-        # before using this feature, implement append() method
+        # extend() allocates once when the number of values is known
         if start_array is not None:
-            for value in start_array:
-                self.append(value)
+            self.extend(start_array)
 
     def __str__(self) -> str:
         """
@@ -45,24 +128,28 @@ class DynamicArray:
 
     def __iter__(self):
         """
-        Create iterator for loop
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Return an iterator over the values in index order. Every loop gets an iterator of its
+        own, so loops over the same array can be nested or run at the same time. Like indexing
+        up to length() on every step, it sees changes made to the array during the loop.
         """
-        self._index = 0
-        return self
+        index = 0
+        while index < self._size:
+            # read self._data every step, a resize during the loop replaces it
+            yield self._data[index]
+            index += 1
 
-    def __next__(self):
+    def __reversed__(self):
         """
-        Obtain next value and advance iterator
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Return an iterator over the values from the last index to index 0
         """
-        try:
-            value = self[self._index]
-        except DynamicArrayException:
-            raise StopIteration
-
-        self._index += 1
-        return value
+        index = self._size - 1
+        while index >= 0:
+            if index >= self._size:
+                # values were removed during the loop, skip ahead to the new last one
+                index = self._size - 1
+                continue
+            yield self._data[index]
+            index -= 1
 
     def get_at_index(self, index: int) -> object:
         """
@@ -76,12 +163,14 @@ class DynamicArray:
 
     def set_at_index(self, index: int, value: object) -> None:
         """
-        Store value at given index in the array
+        Store value at given index in the array, first taking a private copy of
+        storage that is still shared with a copy_on_write() copy
         Invalid index raises DynamicArrayException
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
         if index < 0 or index >= self._size:
             raise DynamicArrayException
+        if self._cow is not None:
+            self._detach()
         self._data[index] = value
 
     def __getitem__(self, index) -> object:
@@ -121,6 +210,24 @@ class DynamicArray:
         """
         return self._capacity
 
+    def get_typecode(self) -> str:
+        """
+        Return the array module typecode of a typed array, or None
+        """
+        return self._typecode
+
+    def get_policy(self) -> ResizePolicy:
+        """
+        Return the resize policy of the array
+        """
+        return self._policy
+
+    def get_resize_stats(self) -> tuple[int, int]:
+        """
+        Return the number of resizes so far and the number of elements they copied
+        """
+        return self._resize_count, self._copy_count
+
     def print_da_variables(self) -> None:
         """
         Print information contained in the dynamic array.
@@ -137,74 +244,187 @@ class DynamicArray:
         """
         if new_capacity < self._size or new_capacity < 1:  # StaticArray requires array sizes of 1 or greater
             return
-        new_static_array = StaticArray(new_capacity)
+        new_static_array = StaticArray(new_capacity, self._typecode)
 
-        # iterate through and copy data over to new StaticArray
-        for i in range(self._size):
-            new_static_array.set(i, self[i])
+        # copy data over to new StaticArray
+        self._data.copy_to(new_static_array, self._size)
+        self._replace_storage(new_static_array, self._size)
 
+    def _replace_storage(self, new_static_array: StaticArray, copied: int) -> None:
+        """
+        Switch to freshly resized storage into which copied elements were copied
+        """
         self._data = new_static_array
-        self._capacity = new_capacity
+        self._capacity = new_static_array.length()
+        self._resize_count += 1
+        self._copy_count += copied
+        if self._cow is not None:
+            # the new storage isn't shared with anyone
+            self._cow.owners -= 1
+            self._cow = None
+
+    def copy_on_write(self) -> "DynamicArray":
+        """
+        Return a copy of this array that shares its storage until either of them is modified,
+        at which point the modified one copies the storage first. Copying is O(1) up front,
+        and free if neither array is ever modified.
+        """
+        if self._cow is None:
+            self._cow = _CowToken()
+        self._cow.owners += 1
+
+        new_da = DynamicArray(typecode=self._typecode, policy=self._policy)
+        new_da._data = self._data
+        new_da._size = self._size
+        new_da._capacity = self._capacity
+        new_da._cow = self._cow
+        return new_da
+
+    def _detach(self) -> None:
+        """
+        Stop sharing storage with copy_on_write() copies, copying it if anyone else still uses it
+        """
+        token = self._cow
+        self._cow = None
+        if token.owners > 1:
+            token.owners -= 1
+            new_static_array = StaticArray(self._capacity, self._typecode)
+            self._data.copy_to(new_static_array, self._size)
+            self._data = new_static_array
+
+    def _storage(self, for_writing: bool = False) -> tuple:
+        """
+        Return the StaticArray holding this array's elements and the index of element 0 in it.
+        Set for_writing before modifying the StaticArray directly.
+        """
+        if for_writing and self._cow is not None:
+            self._detach()
+        return self._data, 0
 
     def append(self, value: object) -> None:
         """
-        Adds new value onto the end of the array, resizing if necessary (doubling capacity)
+        Adds new value onto the end of the array, resizing if necessary (growing capacity
+        as the resize policy says, doubling by default)
         """
-        # check capacity, double if necessary
+        # check capacity, grow if necessary
         if self._size == self._capacity:
-            self.resize(self._capacity * 2)
+            self.resize(self._policy.grow(self._capacity))
 
         # increase self._size by one
         self._size += 1
         # just use bracket notation to set new value
         self[self._size - 1] = value
 
+    def extend(self, values) -> None:
+        """
+        Appends every value of an iterable. When the number of values is known up front
+        (a DynamicArray or anything with len()) the array is resized at most once, to the
+        same capacity repeated growth would reach, otherwise it grows step by step as
+        append() does.
+        """
+        length = _known_length(values)
+        if length is not None:
+            self._make_room(length)
+            if isinstance(values, DynamicArray):
+                # index instead of iterating, which also makes da.extend(da) safe
+                source = values
+                values = (source[i] for i in range(length))
+
+        data, offset = self._storage(for_writing=True)
+        for value in values:
+            if self._size == self._capacity:
+                self.resize(self._policy.grow(self._capacity))
+                data, offset = self._storage(for_writing=True)
+            data[offset + self._size] = value
+            self._size += 1
+
+    def _make_room(self, count: int) -> None:
+        """
+        Resizes once, if needed, to the capacity that appending count values would grow to
+        """
+        new_capacity = self._capacity
+        while new_capacity < self._size + count:
+            new_capacity = self._policy.grow(new_capacity)
+        self.reserve(new_capacity)
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Makes sure the array can hold at least capacity elements without resizing
+        """
+        if capacity > self._capacity:
+            self.resize(capacity)
+
+    def shrink_to_fit(self) -> None:
+        """
+        Reduces the capacity to the number of elements (at least 1, the smallest StaticArray)
+        """
+        if self._capacity > max(self._size, 1):
+            self.resize(max(self._size, 1))
+
     def insert_at_index(self, index: int, value: object) -> None:
         """
-        Add new value at desired index, shifting values over and doubling capacity as necessary.
+        Add new value at desired index, shifting values over and growing capacity as necessary.
         """
         # Raise DynamicArrayException for invalid indices.
         if index > self._size or index < 0:
             raise DynamicArrayException
 
         if self._size == self._capacity:
-            self.resize(self._capacity * 2)
+            self.resize(self._policy.grow(self._capacity))
+        if self._cow is not None:
+            self._detach()
+
+        # shift over values to make an empty slot at desired index, all at once
+        self._data.copy_to(self._data, self._size - index, index, index + 1)
 
         # increase self._size
         self._size += 1
 
-        # shift over values to make an empty slot at desired index
-        # have to iterate backwards so they don't overwrite each other
-        for i in range(self._size - 1, index, -1):
-            self._data[i] = self._data[i - 1]
-
         # insert value at desired index
         self._data[index] = value
 
     def remove_at_index(self, index: int) -> None:
         """
-        Removes desired item from the array. Resize if it gets small enough.
+        Removes desired item from the array. Resize if it gets small enough, as decided by the
+        resize policy (by default once size is below 1/4 of a capacity above 10).
         """
         # the only valid indices are ones that currently hold values.
         if index >= self._size or index < 0:
             raise DynamicArrayException
 
-        # resize capacity if:
-        # capacity is currently greater than 10, and
-        if self._capacity > 10:
-            # size is strictly less than 1/4 of capacity.
-            if self._size * 4 < self._capacity:
-                # if conditions are met, resize capacity to double current size or 10, which ever is larger.
-                new_capacity = max(10, self._size * 2)
-                self.resize(new_capacity)
+        new_capacity = self._policy.shrink(self._size, self._capacity)
+        if new_capacity is not None:
+            # copy everything but the removed value into the smaller StaticArray, which
+            # does the shift at the same time
+            new_static_array = StaticArray(new_capacity, self._typecode)
+            self._data.copy_to(new_static_array, index)
+            self._data.copy_to(new_static_array, self._size - index - 1, index + 1, index)
+            self._size -= 1
+            self._replace_storage(new_static_array, self._size)
+            return
+        if self._cow is not None:
+            self._detach()
 
         # shift over values to overwrite value at specified index
-        for i in range(index, self._size - 1):
-            self[i] = self[i + 1]
+        self._data.copy_to(self._data, self._size - index - 1, index + 1, index)
 
         # decrease self._size by one
         self._size -= 1
 
+    def pop(self) -> object:
+        """
+        Removes and returns the last value. Nothing has to be shifted, so this is O(1) apart
+        from shrinking, which follows the resize policy like remove_at_index() does.
+        """
+        if self._size == 0:
+            raise DynamicArrayException
+        value = self[self._size - 1]
+        new_capacity = self._policy.shrink(self._size, self._capacity)
+        self._size -= 1
+        if new_capacity is not None:
+            self.resize(new_capacity)
+        return value
+
     def slice(self, start_index: int, size: int) -> "DynamicArray":
         """
         Return new dynamic array that is a subset of current dynamic array
@@ -218,18 +438,44 @@ class DynamicArray:
                 stop_index < start_index):
             raise DynamicArrayException
 
-        new_da = DynamicArray()
+        new_da = DynamicArray(typecode=self._typecode, policy=self._policy)
+        new_da._make_room(size)
         # loop through old array, appending desired values onto new array
         for i in range(start_index, stop_index):
             new_da.append(self[i])
         return new_da
 
+    def view(self, start_index: int, size: int) -> "DynamicArrayView":
+        """
+        Return a view of the same elements slice() would copy. The view shares this array's
+        storage, so creating it is O(1) and writes through it change this array.
+        """
+        stop_index = start_index + size
+        if (start_index >= self._size or
+                start_index < 0 or
+                stop_index > self._size or
+                stop_index < start_index):
+            raise DynamicArrayException
+        return DynamicArrayView(self, start_index, size)
+
     def map(self, map_func) -> "DynamicArray":
         """
         create new dynamic array where the value of each element is generated by applying a given
         map function to the corresponding value from the original array.
+        If NumPy is installed, the array holds only floats and map_func is a NumPy ufunc
+        such as np.sqrt, it is applied to the whole array at once. Other functions are
+        always called once per element, as they may count calls or keep state.
         """
-        new_da = DynamicArray()
+        values = None
+        if np is not None and isinstance(map_func, np.ufunc):
+            values = _numeric_ndarray(self, floats_only=True)
+        if values is not None:
+            mapped = _vectorized_call(map_func, values)
+            if mapped is not None and mapped.dtype.kind in 'biuf':
+                return DynamicArray(mapped.tolist(), policy=self._policy)
+
+        new_da = DynamicArray(policy=self._policy)
+        new_da._make_room(self._size)
         # loop through old array, apply map function and append to new dynamic array
         for val in self:
             new_da.append(map_func(val))
@@ -238,8 +484,19 @@ class DynamicArray:
     def filter(self, filter_func) -> "DynamicArray":
         """
         Create new dynamic array populated only with those elements for which filter_func returns True.
+        If NumPy is installed, the array is numeric and filter_func is a NumPy ufunc such as
+        np.isfinite, it is applied to the whole array at once as a boolean mask. Other
+        functions are always called once per element.
         """
-        new_da = DynamicArray()
+        values = None
+        if np is not None and isinstance(filter_func, np.ufunc):
+            values = _numeric_ndarray(self)
+        if values is not None:
+            mask = _vectorized_call(filter_func, values)
+            if mask is not None and mask.dtype.kind == 'b':
+                return DynamicArray(values[mask].tolist(), self._typecode, self._policy)
+
+        new_da = DynamicArray(typecode=self._typecode, policy=self._policy)
         for val in self:
             if filter_func(val):
                 new_da.append(val)
@@ -248,7 +505,17 @@ class DynamicArray:
     def reduce(self, reduce_func, initializer=None) -> object:
         """
         Sequentially apply reduce_func to all elements of dynamic array and return resulting value.
+        If NumPy is installed and the array has numeric typed storage, the ufuncs np.add,
+        np.multiply, np.maximum, np.minimum, np.fmax and np.fmin run as one NumPy reduction
+        (sums and products only for floats). NumPy sums floats pairwise, so the last bits of
+        np.add can differ from the loop. Other functions, including max and operator.add,
+        always run in the loop.
         """
+        if self._size > 0:
+            answer = _vectorized_reduce(self, reduce_func, initializer)
+            if answer is not None:
+                return answer
+
         # initialize answer as first value or as initializer
         answer = initializer
         start_index = 0  # zeroth item not initializer, so apply reduce_func starting there
@@ -263,6 +530,610 @@ class DynamicArray:
             answer = reduce_func(answer, self[i])
         return answer
 
+    def parallel_map(self, map_func, workers: int = None, chunksize: int = None) -> "DynamicArray":
+        """
+        Same result as map(), but the array is split into contiguous chunks that are mapped in
+        a pool of worker processes. workers defaults to the number of CPUs, chunksize to about
+        four chunks per worker. map_func and the values must be picklable, so map_func has to
+        be a module-level function rather than a lambda.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 2 or self._size < PARALLEL_CUTOFF:
+            return self.map(map_func)
+        if chunksize is None:
+            chunksize = -(-self._size // (workers * 4))  # ceiling division
+
+        new_da = DynamicArray(policy=self._policy)
+        new_da._make_room(self._size)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for mapped_chunk in pool.map(_map_chunk, repeat(map_func), self._chunks(chunksize)):
+                new_da.extend(mapped_chunk)
+        return new_da
+
+    def parallel_reduce(self, reduce_func, initializer=None, workers: int = None) -> object:
+        """
+        Same result as reduce() for an associative reduce_func. Each worker process reduces one
+        contiguous chunk, then the partial results are combined pairwise in a tree, keeping
+        their left-to-right order so reduce_func doesn't have to be commutative. The initializer
+        (if any) is combined with the total at the end. Picklability rules are as for
+        parallel_map().
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 2 or self._size < PARALLEL_CUTOFF:
+            return self.reduce(reduce_func, initializer)
+
+        chunksize = -(-self._size // workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = DynamicArray(pool.map(_reduce_chunk, repeat(reduce_func), self._chunks(chunksize)))
+
+        while partials.length() > 1:
+            combined = DynamicArray()
+            for i in range(0, partials.length() - 1, 2):
+                combined.append(reduce_func(partials[i], partials[i + 1]))
+            if partials.length() % 2 == 1:
+                combined.append(partials[partials.length() - 1])  # odd one out
+            partials = combined
+
+        if initializer is None:
+            return partials[0]
+        return reduce_func(initializer, partials[0])
+
+    def _chunks(self, chunksize: int):
+        """
+        Generate consecutive slices of at most chunksize elements covering the whole array
+        """
+        for start in range(0, self._size, chunksize):
+            yield self.slice(start, min(chunksize, self._size - start))
+
+    def lazy(self) -> "LazyDynamicArray":
+        """
+        Return a lazy pipeline over this array. map() and filter() calls on it are only
+        recorded, and collect() / reduce() run all of them in a single pass with no
+        intermediate arrays.
+        """
+        return LazyDynamicArray(self)
+
+
+class _CowToken:
+    """
+    Shared by a DynamicArray and its copy_on_write() copies, counting how many of them
+    still use the same storage
+    """
+
+    def __init__(self) -> None:
+        self.owners = 1
+
+
+class DynamicArrayView(DynamicArray):
+    """
+    Fixed-size window onto part of another DynamicArray, created by DynamicArray.view().
+    Indexing, iteration, slice(), map(), filter(), reduce() and in-place algorithms such as
+    heapsort() work as for any DynamicArray, reading and writing the parent's storage.
+    Operations that would change the length raise DynamicArrayException. A view shouldn't
+    be used after the parent shrinks below the end of the view.
+    """
+
+    def __init__(self, parent: DynamicArray, start_index: int, size: int) -> None:
+        self._parent = parent
+        self._start = start_index
+        self._size = size
+        self._capacity = size
+        self._typecode = parent.get_typecode()
+        self._cow = None
+        self._policy = parent.get_policy()
+        self._resize_count = 0
+        self._copy_count = 0
+
+    def __str__(self) -> str:
+        """
+        Return content of the view in human-readable form
+        """
+        out = f"DYN_ARR_VIEW [{self._start}:{self._start + self._size}] ["
+        out += ', '.join([str(self[_]) for _ in range(self._size)])
+        return out + ']'
+
+    def get_at_index(self, index: int) -> object:
+        """
+        Return value from given index position of the view
+        """
+        if index < 0 or index >= self._size:
+            raise DynamicArrayException
+        return self._parent.get_at_index(self._start + index)
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """
+        Store value at given index position of the view, i.e. in the parent array
+        """
+        if index < 0 or index >= self._size:
+            raise DynamicArrayException
+        self._parent.set_at_index(self._start + index, value)
+
+    def __iter__(self):
+        # a view never changes length, and the parent knows how its own storage is laid out
+        for index in range(self._start, self._start + self._size):
+            yield self._parent.get_at_index(index)
+
+    def __reversed__(self):
+        for index in range(self._start + self._size - 1, self._start - 1, -1):
+            yield self._parent.get_at_index(index)
+
+    def print_da_variables(self) -> None:
+        """
+        Print information contained in the view
+        """
+        print(f"Length: {self._size}, Start: {self._start}, {self}")
+
+    def resize(self, new_capacity: int) -> None:
+        raise DynamicArrayException
+
+    def append(self, value: object) -> None:
+        raise DynamicArrayException
+
+    def extend(self, values) -> None:
+        raise DynamicArrayException
+
+    def reserve(self, capacity: int) -> None:
+        raise DynamicArrayException
+
+    def shrink_to_fit(self) -> None:
+        raise DynamicArrayException
+
+    def insert_at_index(self, index: int, value: object) -> None:
+        raise DynamicArrayException
+
+    def remove_at_index(self, index: int) -> None:
+        raise DynamicArrayException
+
+    def pop(self) -> object:
+        raise DynamicArrayException
+
+    def copy_on_write(self) -> DynamicArray:
+        """
+        A view has no storage of its own to share, so this is a plain copy
+        """
+        return self.slice(0, self._size)
+
+    def _storage(self, for_writing: bool = False) -> tuple:
+        data, offset = self._parent._storage(for_writing)
+        return data, offset + self._start
+
+
+class CircularDynamicArray(DynamicArray):
+    """
+    DynamicArray stored as a ring buffer: element 0 lives at a head offset that moves
+    instead of the elements, and the elements wrap around the end of the StaticArray.
+    append(), appendleft(), pop() and popleft() are amortized O(1), so it works as a
+    queue or deque, and insert_at_index() / remove_at_index() shift whichever side of
+    the index is shorter. Indexing and everything else work as for a DynamicArray.
+    """
+
+    def __init__(self, start_array=None, typecode: str = None, policy: ResizePolicy = None):
+        self._head = 0  # index in self._data of element 0
+        super().__init__(start_array, typecode, policy)
+
+    def __str__(self) -> str:
+        """
+        Return content of the array in human-readable form, in index order
+        """
+        out = "DYN_ARR Size/Cap: "
+        out += str(self._size) + "/" + str(self._capacity) + ' ['
+        out += ', '.join([str(self[_]) for _ in range(self._size)])
+        return out + ']'
+
+    def get_at_index(self, index: int) -> object:
+        """
+        Return value from given index position
+        Invalid index raises DynamicArrayException
+        """
+        if index < 0 or index >= self._size:
+            raise DynamicArrayException
+        index += self._head
+        if index >= self._capacity:
+            index -= self._capacity
+        return self._data[index]
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """
+        Store value at given index in the array
+        Invalid index raises DynamicArrayException
+        """
+        if index < 0 or index >= self._size:
+            raise DynamicArrayException
+        if self._cow is not None:
+            self._detach()
+        index += self._head
+        if index >= self._capacity:
+            index -= self._capacity
+        self._data[index] = value
+
+    def __iter__(self):
+        index = 0
+        while index < self._size:
+            # the head and capacity can change during the loop, so look them up every step
+            position = self._head + index
+            if position >= self._capacity:
+                position -= self._capacity
+            yield self._data[position]
+            index += 1
+
+    def __reversed__(self):
+        index = self._size - 1
+        while index >= 0:
+            if index >= self._size:
+                index = self._size - 1
+                continue
+            position = self._head + index
+            if position >= self._capacity:
+                position -= self._capacity
+            yield self._data[position]
+            index -= 1
+
+    def print_da_variables(self) -> None:
+        """
+        Print information contained in the array
+        """
+        print(f"Length: {self._size}, Capacity: {self._capacity}, Head: {self._head}, {self._data}")
+
+    def resize(self, new_capacity: int) -> None:
+        """
+        Copies the elements in index order into a new StaticArray, so the head goes back to 0
+        """
+        if new_capacity < self._size or new_capacity < 1:
+            return
+        self._replace_storage(self._unwrapped(new_capacity), self._size)
+        self._head = 0
+
+    def _unwrapped(self, capacity: int) -> StaticArray:
+        """
+        Return a new StaticArray of the given capacity holding the elements in index order
+        """
+        new_static_array = StaticArray(capacity, self._typecode)
+        # the part from the head to the end of the StaticArray, then the part that wrapped around
+        first_part = min(self._size, self._capacity - self._head)
+        self._data.copy_to(new_static_array, first_part, self._head)
+        self._data.copy_to(new_static_array, self._size - first_part, 0, first_part)
+        return new_static_array
+
+    def _linearize(self) -> None:
+        """
+        Move the elements into a new StaticArray of the same capacity with the head at 0
+        """
+        self._data = self._unwrapped(self._capacity)
+        self._head = 0
+        if self._cow is not None:
+            # the new storage isn't shared with anyone
+            self._cow.owners -= 1
+            self._cow = None
+
+    def copy_on_write(self) -> "CircularDynamicArray":
+        """
+        Return a copy of this array that shares its storage until either of them is modified
+        """
+        if self._cow is None:
+            self._cow = _CowToken()
+        self._cow.owners += 1
+
+        new_da = CircularDynamicArray(typecode=self._typecode, policy=self._policy)
+        new_da._data = self._data
+        new_da._size = self._size
+        new_da._capacity = self._capacity
+        new_da._head = self._head
+        new_da._cow = self._cow
+        return new_da
+
+    def _detach(self) -> None:
+        """
+        Stop sharing storage with copy_on_write() copies, copying it if anyone else still uses it
+        """
+        if self._cow.owners > 1:
+            self._linearize()
+        else:
+            self._cow = None
+
+    def _storage(self, for_writing: bool = False) -> tuple:
+        """
+        Return the StaticArray holding this array's elements and the index of element 0 in it.
+        The elements are moved to the front first if they wrap around, or if the caller wants
+        to write, since extend() writes past the last element.
+        """
+        if self._head != 0 and (for_writing or self._head + self._size > self._capacity):
+            self._linearize()
+        elif for_writing and self._cow is not None:
+            self._detach()
+        return self._data, self._head
+
+    def appendleft(self, value: object) -> None:
+        """
+        Adds new value at the front of the array, before index 0
+        """
+        if self._size == self._capacity:
+            self.resize(self._policy.grow(self._capacity))
+        if self._cow is not None:
+            self._detach()
+
+        # step the head back, wrapping around to the end of the StaticArray
+        self._head = self._head - 1 if self._head > 0 else self._capacity - 1
+        self._data[self._head] = value
+        self._size += 1
+
+    def popleft(self) -> object:
+        """
+        Removes and returns the value at index 0, shrinking as the resize policy says
+        """
+        if self._size == 0:
+            raise DynamicArrayException
+        value = self._data[self._head]
+        new_capacity = self._policy.shrink(self._size, self._capacity)
+        self._head += 1
+        if self._head == self._capacity:
+            self._head = 0
+        self._size -= 1
+        if new_capacity is not None:
+            self.resize(new_capacity)
+        return value
+
+    def insert_at_index(self, index: int, value: object) -> None:
+        """
+        Add new value at desired index, shifting the values on its shorter side
+        """
+        if index > self._size or index < 0:
+            raise DynamicArrayException
+        if index == 0:
+            self.appendleft(value)
+            return
+
+        if self._size == self._capacity:
+            self.resize(self._policy.grow(self._capacity))
+        if self._cow is not None:
+            self._detach()
+
+        self._size += 1
+        if index < self._size // 2:
+            # step the head back and shift the values before index one step towards the front
+            self._head = self._head - 1 if self._head > 0 else self._capacity - 1
+            for i in range(index):
+                self[i] = self[i + 1]
+        else:
+            for i in range(self._size - 1, index, -1):
+                self[i] = self[i - 1]
+        self[index] = value
+
+    def remove_at_index(self, index: int) -> None:
+        """
+        Removes desired item from the array, shifting the values on its shorter side and
+        shrinking as the resize policy says
+        """
+        if index >= self._size or index < 0:
+            raise DynamicArrayException
+
+        new_capacity = self._policy.shrink(self._size, self._capacity)
+        if index < self._size // 2:
+            # shift the values before index one step towards the back and step the head forward
+            for i in range(index, 0, -1):
+                self[i] = self[i - 1]
+            self._head += 1
+            if self._head == self._capacity:
+                self._head = 0
+        else:
+            for i in range(index, self._size - 1):
+                self[i] = self[i + 1]
+        self._size -= 1
+        if new_capacity is not None:
+            self.resize(new_capacity)
+
+
+class LazyDynamicArray:
+    """
+    Deferred chain of map() / filter() stages over a DynamicArray, created by
+    DynamicArray.lazy(). Every call returns a new pipeline, so a pipeline can be extended
+    in different ways without affecting the original. The source array is read when the
+    pipeline is run, not when it is built.
+    """
+
+    def __init__(self, source: DynamicArray, stages: tuple = ()) -> None:
+        self._source = source
+        self._stages = stages  # (is_map, func) pairs, applied in order
+
+    def map(self, map_func) -> "LazyDynamicArray":
+        """
+        Add a stage that replaces each value with map_func(value)
+        """
+        return LazyDynamicArray(self._source, self._stages + ((True, map_func),))
+
+    def filter(self, filter_func) -> "LazyDynamicArray":
+        """
+        Add a stage that drops values for which filter_func returns False
+        """
+        return LazyDynamicArray(self._source, self._stages + ((False, filter_func),))
+
+    def __iter__(self):
+        """
+        Generate the values coming out of the last stage, one source element at a time
+        """
+        stages = self._stages
+        source = self._source
+        for i in range(source.length()):
+            value = source[i]
+            for is_map, func in stages:
+                if is_map:
+                    value = func(value)
+                elif not func(value):
+                    break
+            else:
+                yield value
+
+    def collect(self) -> DynamicArray:
+        """
+        Run the pipeline and return the results in a new dynamic array. Without any filter
+        stage the output length is known, so the array is sized once up front.
+        """
+        new_da = DynamicArray(policy=self._source.get_policy())
+        if all(is_map for is_map, func in self._stages):
+            new_da._make_room(self._source.length())
+        new_da.extend(self)
+        return new_da
+
+    def reduce(self, reduce_func, initializer=None) -> object:
+        """
+        Run the pipeline and reduce its output, with the same semantics as DynamicArray.reduce()
+        """
+        values = iter(self)
+        answer = initializer
+        if initializer is None:
+            answer = next(values, None)  # first value is the initializer
+        if answer is None:  # if initializer and first value were both none, call it quits
+            return answer
+
+        for value in values:
+            answer = reduce_func(answer, value)
+        return answer
+
+
+def _numeric_ndarray(da: DynamicArray, floats_only: bool = False, for_writing: bool = False):
+    """
+    Returns the contents of da as a 1-D NumPy array, or None if NumPy isn't installed, the
+    array is shorter than VECTORIZE_CUTOFF or its contents aren't all ints or all floats.
+    Typed arrays are viewed in place, without copying, so writes to the result (allowed
+    with for_writing) change da.
+    """
+    if np is None or da._size < VECTORIZE_CUTOFF:
+        return None
+
+    data, offset = da._storage(for_writing)
+    if data is None:  # not stored in one StaticArray
+        return None
+    if da._typecode is not None:
+        if da._typecode not in _NUMERIC_TYPECODES:
+            return None
+        values = np.frombuffer(data.get_buffer(), dtype=da._typecode, count=da._size,
+                               offset=offset * data.get_buffer().itemsize)
+    else:
+        first_type = type(data[offset])
+        if first_type is not int and first_type is not float:
+            return None
+        for i in range(offset + 1, offset + da._size):
+            if type(data[i]) is not first_type:
+                return None
+        values = np.array([data[i] for i in range(offset, offset + da._size)])
+        # ints that don't fit one 64 bit type come back as objects, or as floats when
+        # negative values are mixed with values of 2 ** 63 and up
+        if first_type is int and values.dtype.kind not in 'iu':
+            return None
+
+    if floats_only and values.dtype.kind != 'f':
+        return None
+    return values
+
+
+def _unchecked(da: DynamicArray, for_writing: bool = False) -> tuple:
+    """
+    Returns (items, offset) for indexing da's elements as items[offset + i] without bounds
+    checks, for hot loops that have checked their indices against da.length() once up front.
+    items is the list or typed array inside da's StaticArray, or da itself (offset 0, with
+    the usual checks) if da isn't stored in one StaticArray. Set for_writing before writing.
+    """
+    data, offset = da._storage(for_writing)
+    if data is None:
+        return da, 0
+    return data.get_items(), offset
+
+
+def _vectorized_call(func, values):
+    """
+    Calls a NumPy ufunc on a whole NumPy array. Returns the result if it is an array with one
+    entry per element, or None if it isn't or func raised (including on float errors that plain
+    Python would raise for, like division by zero), so the caller can fall back to a loop.
+    """
+    try:
+        with np.errstate(all='raise'):
+            result = func(values)
+    except Exception:
+        return None
+    if not isinstance(result, np.ndarray) or result.shape != values.shape:
+        return None
+    return result
+
+
+def _vectorized_reduce(da: DynamicArray, reduce_func, initializer=None) -> object:
+    """
+    Reduces a numeric array with reduce_func if it is one of the associative NumPy ufuncs,
+    starting from initializer if given. Returns None if it isn't, or NumPy can't do it safely.
+    """
+    # converting a list-backed array costs more than the reduce loop it would replace
+    if da._typecode is None:
+        return None
+    values = _numeric_ndarray(da)
+    if values is None:
+        return None
+    if not isinstance(reduce_func, np.ufunc):
+        return None
+    name = reduce_func.__name__
+    if name not in _ASSOCIATIVE_UFUNCS or getattr(np, name) is not reduce_func:
+        return None
+    if values.dtype.kind != 'f' and not _ASSOCIATIVE_UFUNCS[name]:
+        return None
+
+    try:
+        with np.errstate(all='raise'):
+            if initializer is None:
+                return reduce_func.reduce(values).item()
+            return reduce_func.reduce(values, initial=initializer).item()
+    except Exception:
+        return None
+
+
+def _vectorized_sort(da: DynamicArray, descending: bool) -> bool:
+    """
+    Sorts a numeric array with NumPy, in place. Returns False without touching the array if
+    _numeric_ndarray() can't convert it.
+    """
+    values = _numeric_ndarray(da, for_writing=True)
+    if values is None:
+        return False
+    if da._typecode is not None:
+        # values is a view of the typed buffer, so sorting it sorts the array itself
+        if descending:
+            values[::-1].sort()
+        else:
+            values.sort()
+        return True
+
+    values.sort()
+    if descending:
+        values = values[::-1]
+    sorted_values = values.tolist()
+    data, offset = da._storage(for_writing=True)
+    for i in range(da._size):
+        data[offset + i] = sorted_values[i]
+    return True
+
+
+def _known_length(values) -> int:
+    """
+    Returns the number of values in an iterable if it can be found without consuming it, else None
+    """
+    if isinstance(values, DynamicArray):
+        return values.length()
+    if hasattr(values, "__len__"):
+        return len(values)
+    return None
+
+
+def _map_chunk(map_func, arr: DynamicArray) -> DynamicArray:
+    """
+    Worker process side of DynamicArray.parallel_map()
+    """
+    return arr.map(map_func)
+
+
+def _reduce_chunk(reduce_func, arr: DynamicArray) -> object:
+    """
+    Worker process side of DynamicArray.parallel_reduce()
+    """
+    return arr.reduce(reduce_func)
+
 
 def chunk(arr: DynamicArray) -> "DynamicArray":
     """
@@ -292,9 +1163,12 @@ def chunk(arr: DynamicArray) -> "DynamicArray":
 def find_mode(arr: DynamicArray) -> tuple[DynamicArray, int]:
     """
     takes a dynamic array in sorted order, returns tuple with first item being dynamic array of the mode(s)
-    and the second item being their frequency
+    and the second item being their frequency. An empty array has no modes and frequency 0.
+    For unsorted input use find_mode_unsorted().
     """
     modes = DynamicArray()
+    if arr.is_empty():
+        return modes, 0
     modes.append(arr[0])  # first item in modes array, for now
     freq = 1  # first item appears at least once
 
@@ -317,6 +1191,36 @@ def find_mode(arr: DynamicArray) -> tuple[DynamicArray, int]:
     return modes, freq
 
 
+def count_frequencies(values) -> dict:
+    """
+    Counts how often each value occurs in a dynamic array or any other iterable, in one pass.
+    Returns a dict of value -> count, in order of first occurrence. Values must be hashable.
+    """
+    counts = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def find_mode_unsorted(values) -> tuple[DynamicArray, int]:
+    """
+    Same result as find_mode(), but for a dynamic array (or any iterable) in any order,
+    in O(n) with a hash table instead of requiring sorted input. Modes are listed in order
+    of first occurrence. Values must be hashable.
+    """
+    counts = count_frequencies(values)
+    freq = 0
+    for count in counts.values():
+        if count > freq:
+            freq = count
+
+    modes = DynamicArray()
+    for value, count in counts.items():
+        if count == freq:
+            modes.append(value)
+    return modes, freq
+
+
 # ------------------- BASIC TESTING -----------------------------------------
 
 
@@ -536,6 +1440,104 @@ if __name__ == "__main__":
     print(da.reduce(lambda x, y: x + y ** 2, -1))
 
 
+    print("\n# lazy example 1")
+    da = DynamicArray([1, 5, 10, 15, 20, 25])
+    pipeline = da.lazy().map(lambda x: x ** 2)
+    print(pipeline.collect())
+    print(pipeline.filter(lambda x: x > 100).collect())
+    print(pipeline.filter(lambda x: x > 100).reduce(lambda x, y: x + y))
+    print(pipeline.filter(lambda x: x > 1000).reduce(lambda x, y: x + y))
+    print(pipeline.filter(lambda x: x > 1000).reduce(lambda x, y: x + y, -1))
+    print(DynamicArray().lazy().map(lambda x: x + 1).collect())
+
+
+    print("\n# parallel_map / parallel_reduce example 1")
+    da = DynamicArray(range(-PARALLEL_CUTOFF, PARALLEL_CUTOFF))
+    mapped = da.parallel_map(abs, workers=4)
+    print(mapped.length(), mapped[0], mapped[PARALLEL_CUTOFF], mapped[mapped.length() - 1])
+    print(da.parallel_reduce(max, workers=3), da.parallel_reduce(min, -PARALLEL_CUTOFF - 1, workers=3))
+    print(mapped.parallel_reduce(operator.add, workers=4), mapped.reduce(operator.add))
+    print(DynamicArray([3, 1, 2]).parallel_reduce(operator.add, 10, workers=4))
+
+
+    print("\n# typed storage example 1")
+    da = DynamicArray([1.5, 2.5, 3.5], typecode='d')
+    da.append(4.5)
+    da.insert_at_index(0, 0.5)
+    print(da, da.get_typecode())
+    print(da.slice(1, 2).get_typecode(), da.filter(lambda x: x > 2).get_typecode(), da.map(str).get_typecode())
+    try:
+        da.append("not a float")
+    except TypeError as e:
+        print("Exception raised:", type(e))
+
+
+    print("\n# extend / reserve / shrink_to_fit example 1")
+    da = DynamicArray()
+    da.reserve(10)
+    da.print_da_variables()
+    da.extend([1, 2, 3])
+    da.extend(DynamicArray([4, 5]))
+    da.extend(value * 10 for value in range(6, 12))
+    print(da)
+    da.extend(da)
+    print(da)
+    da.shrink_to_fit()
+    print(da)
+    print(DynamicArray(range(5)), DynamicArray(value for value in range(5)))
+
+    print("\n# resize policy example 1")
+    for policy in [DEFAULT_POLICY, NEVER_SHRINK, ResizePolicy(1.5, 8, 4, 4)]:
+        da = DynamicArray(policy=policy)
+        for i in range(40):
+            da.append(i)
+        for i in range(38):
+            da.remove_at_index(0)
+        print(policy)
+        print(da, da.get_resize_stats())
+
+    print("\n# pop example 1")
+    da = DynamicArray([1, 2, 3, 4, 5])
+    print(da.pop(), da.pop(), da)
+
+    print("\n# iterator example 1")
+    da = DynamicArray([1, 2, 3])
+    print([(x, y) for x in da for y in da])
+    print(list(reversed(da)), list(reversed(da.view(1, 2))))
+
+    print("\n# circular array example 1")
+    da = CircularDynamicArray([3, 4, 5])
+    da.appendleft(2)
+    da.appendleft(1)
+    da.append(6)
+    print(da)
+    da.print_da_variables()
+    print(da.popleft(), da.pop(), da.popleft(), da)
+    da.insert_at_index(1, 3.5)
+    da.remove_at_index(0)
+    print(da, da.view(1, 2))
+
+    print("\n# view example 1")
+    da = DynamicArray([1, 2, 3, 4, 5, 6, 7, 8, 9])
+    da_view = da.view(2, 4)
+    print(da_view, da_view.length(), da_view[0])
+    da_view[0] = 30
+    print(da, da_view.map(lambda x: x * 10), da_view.filter(lambda x: x > 4))
+    print(da_view.reduce(lambda x, y: x + y), [value for value in da_view])
+    print(da.view(6, 3).view(1, 2), da_view.slice(1, 2))
+    try:
+        da_view.append(10)
+    except DynamicArrayException as e:
+        print("Exception raised:", type(e))
+
+    print("\n# copy_on_write example 1")
+    da = DynamicArray([1, 2, 3])
+    da_copy = da.copy_on_write()
+    da_copy[0] = 100
+    da.append(4)
+    print(da, da_copy)
+
+
     def print_chunked_da(arr: DynamicArray):
         if len(str(arr)) <= 100:
             print(arr)
@@ -587,3 +1589,17 @@ if __name__ == "__main__":
         da.append(case[x])
         mode, frequency = find_mode(da)
         print(f"{da}\nMode: {mode}, Frequency: {frequency}")
+
+    print("\n# find_mode_unsorted example 1")
+    test_cases = (
+        [],
+        [3, 1, 3, 2, 1, 4],
+        ["Fig", "Date", "Apple", "Date", "Fig", "Date", "Fig"]
+    )
+
+    for case in test_cases:
+        da = DynamicArray(case)
+        mode, frequency = find_mode_unsorted(da)
+        print(f"{da}\nMode: {mode}, Frequency: {frequency}\n")
+    mode, frequency = find_mode_unsorted(word for word in "a b a c b a".split())
+    print(f"Mode: {mode}, Frequency: {frequency}")
@@ -9,7 +9,12 @@
 #               heapsort(), etc.
 
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 from dynamic_array import *
+from dynamic_array import _known_length, _unchecked, _vectorized_sort
 
 
 class MinHeapException(Exception):
@@ -21,18 +26,40 @@ class MinHeapException(Exception):
 
 
 class MinHeap:
-    def __init__(self, start_heap=None):
+    # optional callback(index, node), invoked whenever a node is written to a new index of the
+    # heap array. MinHeap itself doesn't need it, IndexedMinHeap uses it to track positions.
+    _on_move = None
+
+    def __init__(self, start_heap=None, arity: int = 2, typecode: str = None,
+                 compact_threshold: float = 0.5, key=None):
         """
-        Initialize a new MinHeap
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Initialize a new MinHeap. arity is the number of children per node (2 is the
+        classic binary heap), wider heaps are shallower so add() does fewer swaps.
+        typecode selects typed storage for the underlying DynamicArray.
+        compact_threshold is the fraction of discarded entries at which the heap
+        array is rebuilt without them, see discard().
+        key, if given, is called once on every node as it is added, and nodes are ordered
+        by their keys instead of by comparing the nodes, equal keys in the order added.
         """
-        self._heap = DynamicArray()
+        if arity < 2 or not 0 < compact_threshold <= 1:
+            raise MinHeapException
+        self._arity = arity
+        self._heap = DynamicArray(typecode=typecode)
+        self._key = key
+        # (key, order) entry of every node, at the same index as the node in self._heap.
+        # order counts up with every node added, so entries never tie and nodes never get compared
+        self._keys = None if key is None else DynamicArray()
+        self._order = 0
+        self._compact_threshold = compact_threshold
+        self._live = None  # node -> number of live copies, only kept once discard() is used
+        self._dead = {}  # node -> number of discarded copies still in the heap array
+        self._dead_count = 0  # total of self._dead
+        self._compactions = 0
 
         # populate MinHeap with initial values (if provided)
-        # before using this feature, implement add() method
+        # add_many() heapifies the whole batch in O(n) instead of n separate add() calls
         if start_heap:
-            for node in start_heap:
-                self.add(node)
+            self.add_many(start_heap)
 
     def __str__(self) -> str:
         """
@@ -46,34 +73,115 @@ class MinHeap:
         """
         Adds an element to the heap while maintaining heap properties.
         """
+        # key and count first, so if either raises nothing has been added yet
+        entry = None if self._keys is None else self._entry(node)
+        if self._live is not None:
+            self._live[node] = self._live.get(node, 0) + 1
+        if self._keys is not None:
+            self._keys.append(entry)
         # add to the last spot in the array
         self._heap.append(node)
         # percolate up until it's priority value is greater its parent
         self._percolate_up(self._heap.length() - 1)
 
+    def add_many(self, nodes) -> None:
+        """
+        Adds every element of an iterable to the heap. Small batches are percolated up one
+        at a time, large batches (relative to the current heap) are heapified in O(n).
+        """
+        # work out every key and count before adding anything, so if one of them raises
+        # the heap is left as it was
+        if self._keys is not None or self._live is not None:
+            nodes = DynamicArray(nodes)
+        if self._keys is not None:
+            entries = DynamicArray(self._entry(node) for node in nodes)
+        if self._live is not None:
+            new_counts = {}
+            for node in nodes:
+                new_counts[node] = new_counts.get(node, 0) + 1
+            for node, count in new_counts.items():
+                self._live[node] = self._live.get(node, 0) + count
+        if self._keys is not None:
+            self._keys.extend(entries)
+        old_size = self._heap.length()
+        self._heap.extend(nodes)
+        added = self._heap.length() - old_size
+        if added == 0:
+            return
+
+        if _should_heapify(old_size, added):
+            heapify(self._heap, self._on_move, self._arity, self._keys)
+        else:
+            # each new node only looks at its ancestors, which are already a valid heap
+            for node_index in range(old_size, self._heap.length()):
+                self._percolate_up(node_index)
+
     def _percolate_up(self, node_index: int) -> None:
         """
         Percolates up the specified node to maintain heap property
         """
+        if node_index < 0 or node_index >= self._heap.length():
+            raise MinHeapException
+        if self._keys is not None:
+            self._percolate_up_keyed(node_index)
+            return
+        # every index below is a valid one, so skip the per-access bounds checks
+        items, offset = _unchecked(self._heap, for_writing=True)
+        node = items[offset + node_index]
+
         spot_found = False
         while not spot_found:
             if node_index == 0:
                 return  # terminate while loop if the OG node is now the root
-            parent_index = (node_index - 1) // 2  # floor division to find parent index
-            parent = self._heap[parent_index]
-            node = self._heap[node_index]
+            parent_index = (node_index - 1) // self._arity  # floor division to find parent index
+            parent = items[offset + parent_index]
             if node < parent:
-                self._heap[node_index] = parent
-                self._heap[parent_index] = node
+                items[offset + node_index] = parent
+                items[offset + parent_index] = node
+                if self._on_move is not None:
+                    self._on_move(node_index, parent)
+                    self._on_move(parent_index, node)
                 node_index = parent_index  # update node index for next run through while loop
             else:
                 spot_found = True
 
+    def _percolate_up_keyed(self, node_index: int) -> None:
+        """
+        Percolates up the specified node, comparing the key entries of the nodes
+        """
+        items, offset = _unchecked(self._heap, for_writing=True)
+        key_items, key_offset = _unchecked(self._keys, for_writing=True)
+        node = items[offset + node_index]
+        entry = key_items[key_offset + node_index]
+
+        while node_index > 0:
+            parent_index = (node_index - 1) // self._arity
+            parent_entry = key_items[key_offset + parent_index]
+            if not entry < parent_entry:
+                return
+            parent = items[offset + parent_index]
+            items[offset + node_index] = parent
+            items[offset + parent_index] = node
+            key_items[key_offset + node_index] = parent_entry
+            key_items[key_offset + parent_index] = entry
+            if self._on_move is not None:
+                self._on_move(node_index, parent)
+                self._on_move(parent_index, node)
+            node_index = parent_index
+
+    def _entry(self, node: object) -> tuple:
+        """
+        Computes the key of a node being added and returns its (key, order) entry
+        """
+        entry = (self._key(node), self._order)
+        self._order += 1
+        return entry
+
     def is_empty(self) -> bool:
         """
         Returns True if heap is empty, otherwise returns False
         """
-        return self._heap.is_empty()  # implement with preexisting DynamicArray method
+        return self._heap.length() == self._dead_count  # discarded entries don't count
 
     def get_min(self) -> object:
         """
@@ -82,6 +190,8 @@ class MinHeap:
         """
         if self.is_empty():
             raise MinHeapException
+        if self._dead_count:
+            self._drop_dead_roots()
         return self._heap[0]
 
     def remove_min(self) -> object:
@@ -91,117 +201,574 @@ class MinHeap:
         """
         if self.is_empty():
             raise MinHeapException
+        if self._dead_count:
+            self._drop_dead_roots()
+        min_node = self._pop_root()
+        if self._live is not None:
+            self._forget(min_node)
+        return min_node
+
+    def _pop_root(self) -> object:
+        """
+        Removes and returns the root of a non-empty heap array
+        """
         # store value of root node
         min_node = self._heap[0]
-        # store value of last element at index zero
-        last_node_index = self._heap.length() - 1
-        self._heap[0] = self._heap[last_node_index]
-        # remove last element
-        self._heap.remove_at_index(last_node_index)
-        # percolate new root down
-        percolate_down(self._heap, 0, self.size() - 1)
+        # remove last element and store it at index zero, unless it was the root
+        last_node = self._heap.pop()
+        last_entry = None if self._keys is None else self._keys.pop()
+        if not self._heap.is_empty():
+            self._heap[0] = last_node
+            if self._keys is not None:
+                self._keys[0] = last_entry
+            if self._on_move is not None:
+                self._on_move(0, last_node)
+            # percolate new root down
+            percolate_down(self._heap, 0, self._heap.length() - 1, self._on_move, self._arity,
+                           self._keys)
         # return value of root node
         return min_node
 
+    def discard(self, node: object) -> None:
+        """
+        Removes one copy of node (compared with ==, so nodes must be hashable) from the heap in
+        O(1), by leaving a tombstone for it. get_min(), remove_min() and the other methods skip
+        tombstoned entries when they reach the root, and once they make up more than
+        compact_threshold of the heap array it is rebuilt without them in O(n).
+        Raises MinHeapException if node isn't in the heap.
+        The first discard() counts the nodes in the heap, O(n) once, and from then on add()
+        and remove_min() keep that count up to date.
+        """
+        if self._live is None:
+            # count the live copies of every node, the heap array minus the tombstones. The
+            # counts only replace None once counting worked, so unhashable nodes raise TypeError
+            # here without breaking the heap
+            live = {}
+            for node_in_heap in self._heap:
+                live[node_in_heap] = live.get(node_in_heap, 0) + 1
+            for dead_node, count in self._dead.items():
+                live[dead_node] -= count
+            self._live = live
+        if self._live.get(node, 0) == 0:
+            raise MinHeapException
+
+        self._forget(node)
+        self._dead[node] = self._dead.get(node, 0) + 1
+        self._dead_count += 1
+        if self._dead_count > self._compact_threshold * self._heap.length():
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Rebuilds the heap array without the entries left behind by discard(), in O(n)
+        """
+        if not self._dead_count:
+            return
+        # which copy of an equal node goes doesn't matter, so skip the first ones found
+        to_skip = dict(self._dead)
+        live_nodes = DynamicArray(typecode=self._heap.get_typecode())
+        live_nodes.reserve(self._heap.length() - self._dead_count)
+        live_entries = None if self._keys is None else DynamicArray()
+        for node_index in range(self._heap.length()):
+            node = self._heap[node_index]
+            if to_skip.get(node, 0):
+                to_skip[node] -= 1
+            else:
+                live_nodes.append(node)
+                if live_entries is not None:
+                    live_entries.append(self._keys[node_index])
+        self._heap = live_nodes
+        self._keys = live_entries
+        heapify(self._heap, self._on_move, self._arity, self._keys)
+        self._dead = {}
+        self._dead_count = 0
+        self._compactions += 1
+
+    def get_tombstone_stats(self) -> tuple[int, int, int]:
+        """
+        Returns the number of live entries, the number of discarded entries still in the
+        heap array and the number of compactions so far
+        """
+        return self.size(), self._dead_count, self._compactions
+
+    def _drop_dead_roots(self) -> None:
+        """
+        Removes tombstoned entries from the root until the root is a live one
+        """
+        while self._dead_count and self._dead.get(self._heap[0], 0):
+            node = self._pop_root()
+            self._dead[node] -= 1
+            if self._dead[node] == 0:
+                del self._dead[node]
+            self._dead_count -= 1
+
+    def _forget(self, node: object) -> None:
+        """
+        Lowers the live count of a node leaving the heap
+        """
+        self._live[node] -= 1
+        if self._live[node] == 0:
+            del self._live[node]
+
+    def pushpop(self, node: object) -> object:
+        """
+        Adds node to the heap and then removes and returns the minimum, in one percolate
+        down and without changing the size of the underlying array. If node is not greater
+        than the current minimum it is returned right away and the heap is untouched.
+        """
+        if self.is_empty():
+            return node
+        if self._dead_count:
+            self._drop_dead_roots()
+        if self._keys is not None:
+            # node was added last, so it loses ties with the root
+            entry = self._entry(node)
+            if not self._keys[0] < entry:
+                return node
+            return self._replace_root(node, entry)
+        if not self._heap[0] < node:
+            return node
+        return self._replace_root(node)
+
+    def replace(self, node: object) -> object:
+        """
+        Removes and returns the minimum and then adds node to the heap, in one percolate
+        down and without changing the size of the underlying array. Unlike pushpop(), the
+        returned object may be greater than node. If the heap is empty, the method raises
+        a MinHeapException.
+        """
+        if self.is_empty():
+            raise MinHeapException
+        if self._dead_count:
+            self._drop_dead_roots()
+        return self._replace_root(node, None if self._keys is None else self._entry(node))
+
+    def _replace_root(self, node: object, entry: tuple = None) -> object:
+        """
+        Overwrites the (live) root with node, and its key entry if the heap has keys,
+        percolates it down and returns the old root
+        """
+        min_node = self._heap[0]
+        self._heap[0] = node
+        if self._keys is not None:
+            self._keys[0] = entry
+        if self._on_move is not None:
+            self._on_move(0, node)
+        percolate_down(self._heap, 0, self._heap.length() - 1, self._on_move, self._arity, self._keys)
+        if self._live is not None:
+            self._forget(min_node)
+            self._live[node] = self._live.get(node, 0) + 1
+        return min_node
+
     def build_heap(self, da: DynamicArray) -> None:
         """
         Builds a heap out of an unsorted array, overwriting current contents
-        of the heap.
+        of the heap. The heap shares da's storage copy-on-write, so the data is
+        only copied once either side changes it, and never if da is already a heap.
         """
+        self._live = None
+        self._dead = {}
+        self._dead_count = 0
+
         # Handle empty array edge case
         if da.is_empty():
-            self._heap = DynamicArray()
+            self._heap = DynamicArray(typecode=da.get_typecode())
+            if self._keys is not None:
+                self._keys = DynamicArray()
             return
 
-        self._heap = da.slice(0, da.length())  # copy over data
-        # start at first non-leaf node, percolate down
-        last_node_index = self._heap.length() - 1
-        node_index = (last_node_index - 1) // 2
-
-        # node_index could be -1 immediately, but while loop handles this
-        while node_index >= 0:
-            percolate_down(self._heap, node_index, self.size() - 1)
-            node_index -= 1
+        if self._keys is not None:
+            self._order = 0
+            self._keys = DynamicArray(self._entry(node) for node in da)
+        self._heap = da.copy_on_write()
+        heapify(self._heap, self._on_move, self._arity, self._keys)
 
     def size(self) -> int:
         """
         Returns the number of items currently stored on the heap.
         """
-        return self._heap.length()
+        return self._heap.length() - self._dead_count
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the heap.
+        """
+        self._heap = DynamicArray(typecode=self._heap.get_typecode())
+        if self._keys is not None:
+            self._keys = DynamicArray()
+        self._live = None
+        self._dead = {}
+        self._dead_count = 0
+
+
+class _IndexedNode:
+    """
+    Entry stored by IndexedMinHeap. Nodes are ordered by priority only, so handles
+    never need to be comparable.
+    """
+
+    def __init__(self, handle, priority) -> None:
+        self.handle = handle
+        self.priority = priority
+
+    def __lt__(self, other: "_IndexedNode") -> bool:
+        return self.priority < other.priority
+
+    def __le__(self, other: "_IndexedNode") -> bool:
+        return self.priority <= other.priority
+
+    def __repr__(self) -> str:
+        return f"({self.handle!r}, {self.priority!r})"
+
+
+class IndexedMinHeap(MinHeap):
+    """
+    MinHeap of (handle, priority) pairs that remembers where every handle lives in the
+    heap array, so the priority of a queued handle can be changed or the handle removed
+    in O(log n) instead of pushing duplicate entries. Handles must be hashable and unique.
+    """
+
+    def __init__(self, start_heap=None, arity: int = 2):
+        """
+        Initialize a new IndexedMinHeap from an optional iterable of (handle, priority) pairs
+        """
+        self._positions = {}  # handle -> index in self._heap
+        self._on_move = self._record_position
+        super().__init__(start_heap, arity)
+
+    def _record_position(self, index: int, node: _IndexedNode) -> None:
+        """
+        Callback for MinHeap._on_move, keeps the position map in sync with every swap
+        """
+        self._positions[node.handle] = index
+
+    def _make_nodes(self, pairs, first_index: int) -> DynamicArray:
+        """
+        Turns (handle, priority) pairs into nodes and records the index each node will be
+        appended at. Nothing is recorded if any handle is a duplicate.
+        """
+        nodes = DynamicArray()
+        new_handles = set()
+        for handle, priority in pairs:
+            if handle in self._positions or handle in new_handles:
+                raise MinHeapException
+            new_handles.add(handle)
+            nodes.append(_IndexedNode(handle, priority))
+
+        for i in range(nodes.length()):
+            self._positions[nodes[i].handle] = first_index + i
+        return nodes
+
+    def add(self, handle, priority) -> None:
+        """
+        Adds a handle with the given priority. Raises MinHeapException if the handle is
+        already in the heap.
+        """
+        if handle in self._positions:
+            raise MinHeapException
+        self._positions[handle] = self._heap.length()
+        super().add(_IndexedNode(handle, priority))
+
+    def add_many(self, pairs) -> None:
+        """
+        Adds every (handle, priority) pair of an iterable to the heap
+        """
+        super().add_many(self._make_nodes(pairs, self._heap.length()))
+
+    def get_min(self) -> tuple:
+        """
+        Returns the (handle, priority) pair with the smallest priority without removing it
+        """
+        node = super().get_min()
+        return node.handle, node.priority
+
+    def remove_min(self) -> tuple:
+        """
+        Removes and returns the (handle, priority) pair with the smallest priority
+        """
+        node = super().remove_min()
+        del self._positions[node.handle]
+        return node.handle, node.priority
+
+    def pushpop(self, handle, priority) -> tuple:
+        """
+        Adds a handle, then removes and returns the (handle, priority) pair with the smallest
+        priority, which may be the pair just added. Raises MinHeapException if the handle is
+        already in the heap.
+        """
+        if handle in self._positions:
+            raise MinHeapException
+        node = _IndexedNode(handle, priority)
+        min_node = super().pushpop(node)
+        if min_node is not node:
+            del self._positions[min_node.handle]
+        return min_node.handle, min_node.priority
+
+    def replace(self, handle, priority) -> tuple:
+        """
+        Removes and returns the (handle, priority) pair with the smallest priority, then adds
+        the new handle. Raises MinHeapException if the heap is empty or the handle is already
+        in the heap.
+        """
+        if handle in self._positions:
+            raise MinHeapException
+        min_node = super().replace(_IndexedNode(handle, priority))
+        del self._positions[min_node.handle]
+        return min_node.handle, min_node.priority
+
+    def build_heap(self, pairs: DynamicArray) -> None:
+        """
+        Builds the heap out of a dynamic array of (handle, priority) pairs, overwriting
+        current contents of the heap.
+        """
+        self._positions = {}
+        # the nodes array is new and private, so the heap can take it over as is
+        self._heap = self._make_nodes(pairs, 0)
+        heapify(self._heap, self._on_move, self._arity)
 
     def clear(self) -> None:
         """
         Clears the contents of the heap.
         """
-        self._heap = DynamicArray()
+        super().clear()
+        self._positions = {}
 
+    def contains(self, handle) -> bool:
+        """
+        Returns True if the handle is currently in the heap, in O(1)
+        """
+        return handle in self._positions
+
+    def get_priority(self, handle) -> object:
+        """
+        Returns the current priority of a handle. Raises MinHeapException if it isn't in the heap.
+        """
+        return self._node(handle).priority
 
-def percolate_down(da: DynamicArray, node_index: int, max_index: int) -> None:
+    def decrease_key(self, handle, priority) -> None:
+        """
+        Lowers the priority of a handle. Raises MinHeapException if the handle isn't in the
+        heap or the new priority is greater than the current one.
+        """
+        node = self._node(handle)
+        if node.priority < priority:
+            raise MinHeapException
+        node.priority = priority
+        self._percolate_up(self._positions[handle])
+
+    def increase_key(self, handle, priority) -> None:
+        """
+        Raises the priority of a handle. Raises MinHeapException if the handle isn't in the
+        heap or the new priority is less than the current one.
+        """
+        node = self._node(handle)
+        if priority < node.priority:
+            raise MinHeapException
+        node.priority = priority
+        percolate_down(self._heap, self._positions[handle], self._heap.length() - 1, self._on_move, self._arity)
+
+    def update(self, handle, priority) -> None:
+        """
+        Changes the priority of a handle in either direction
+        """
+        if priority < self._node(handle).priority:
+            self.decrease_key(handle, priority)
+        else:
+            self.increase_key(handle, priority)
+
+    def remove(self, handle) -> object:
+        """
+        Removes a handle from the heap and returns its priority. Raises MinHeapException
+        if the handle isn't in the heap.
+        """
+        node = self._node(handle)
+        node_index = self._positions.pop(handle)
+
+        # fill the hole with the last node, then move that node whichever way it needs to go
+        last_node_index = self._heap.length() - 1
+        last_node = self._heap.pop()
+        if node_index != last_node_index:
+            self._heap[node_index] = last_node
+            self._record_position(node_index, last_node)
+            self._percolate_up(node_index)
+            percolate_down(self._heap, self._positions[last_node.handle], self._heap.length() - 1,
+                           self._on_move, self._arity)
+        return node.priority
+
+    def discard(self, handle) -> None:
+        """
+        Removes a handle from the heap. The position of every handle is known, so this
+        removes it right away with remove() instead of leaving a tombstone.
+        """
+        self.remove(handle)
+
+    def _node(self, handle) -> _IndexedNode:
+        """
+        Returns the heap node of a handle, raising MinHeapException if there isn't one
+        """
+        if handle not in self._positions:
+            raise MinHeapException
+        return self._heap[self._positions[handle]]
+
+
+def heapify(da: DynamicArray, on_move=None, arity: int = 2, keys: DynamicArray = None) -> None:
+    """
+    Rearranges a dynamic array in place so that it satisfies the heap property.
+    Runs in O(n) by percolating down every non-leaf node, starting from the last one.
+    on_move, arity and keys are passed through to percolate_down().
+    """
+    # start at first non-leaf node, percolate down
+    last_node_index = da.length() - 1
+    node_index = (last_node_index - 1) // arity
+
+    # node_index could be -1 immediately, but while loop handles this
+    while node_index >= 0:
+        percolate_down(da, node_index, last_node_index, on_move, arity, keys)
+        node_index -= 1
+
+
+def _should_heapify(old_size: int, added: int) -> bool:
+    """
+    Decides whether a batch of added nodes is cheaper to fix with a full heapify
+    (about 2 * total comparisons) or by percolating each new node up (about
+    log2(old_size) comparisons per node in the worst case).
+    """
+    # a batch at least as big as the heap itself (including the empty heap) is always rebuilt
+    if added >= old_size:
+        return True
+    return 2 * (old_size + added) < added * old_size.bit_length()
+
+
+def percolate_down(da: DynamicArray, node_index: int, max_index: int, on_move=None,
+                   arity: int = 2, keys: DynamicArray = None) -> None:
     """
     Perform percolate down operation in place on dynamic array. Node at node_index
-    is percolated down, not past max_index.
+    is percolated down, not past max_index. The children of node i are stored at
+    arity * i + 1 through arity * i + arity. If given, on_move(index, node) is called
+    for both nodes of every swap. If keys is given, it is an array as long as da whose
+    values are compared instead of da's, and da's nodes move along with them.
     """
+    # this is for HeapSort... ensures we don't stray out of the heap
+    #       section of the array while sorting in place.
+    max_index = min(max_index, da.length() - 1)
+    if node_index < 0:
+        raise DynamicArrayException
+    if node_index * arity + 1 > max_index:
+        return  # no children, nothing to do
+    if keys is not None:
+        _percolate_down_keyed(da, keys, node_index, max_index, on_move, arity)
+        return
+
+    # every index below is between 0 and max_index, so skip the per-access bounds checks.
+    # Reading doesn't copy copy-on-write storage, the first swap does.
+    items, offset = _unchecked(da)
+    writable = False
+    node = items[offset + node_index]
+
     spot_found = False
     while not spot_found:
-        # find both children of current node
-        left_child_index = node_index * 2 + 1
-        right_child_index = node_index * 2 + 2
-        try:
-            left_child = da.get_at_index(left_child_index)
-        except DynamicArrayException:
-            left_child = None
-        try:
-            right_child = da.get_at_index(right_child_index)
-        except DynamicArrayException:
-            right_child = None
-
-        # this chunk is for HeapSort... ensures we don't stray out of the heap
-        #       section of the array while sorting in place.
-        if left_child_index > max_index:
-            left_child = None
-        if right_child_index > max_index:
-            right_child = None
-
-        # keep the smaller child
-        # or if right and left are equal keep the left child
-        # or if one doesn't exist, keep the one that does
-        # or if neither exists, kick out of the while loop
-        if left_child is None and right_child is None:
+        first_child_index = node_index * arity + 1
+        # if there are no children, kick out of the while loop
+        if first_child_index > max_index:
             return
-        elif right_child is None or left_child <= right_child:
-            favorite_child = left_child
-            fav_child_index = left_child_index
-        else:
-            favorite_child = right_child
-            fav_child_index = right_child_index
+
+        # keep the smallest child, or the leftmost one if several are equal
+        favorite_child = items[offset + first_child_index]
+        fav_child_index = first_child_index
+        last_child_index = min(first_child_index + arity - 1, max_index)
+        for child_index in range(first_child_index + 1, last_child_index + 1):
+            child = items[offset + child_index]
+            if child < favorite_child:
+                favorite_child = child
+                fav_child_index = child_index
 
         # swap if child is less than parent
-        node = da.get_at_index(node_index)
         if favorite_child < node:
-            da[node_index] = favorite_child
-            da[fav_child_index] = node
+            if not writable:
+                items, offset = _unchecked(da, for_writing=True)
+                writable = True
+            items[offset + node_index] = favorite_child
+            items[offset + fav_child_index] = node
+            if on_move is not None:
+                on_move(node_index, favorite_child)
+                on_move(fav_child_index, node)
             node_index = fav_child_index  # update node index for next run through while loop
         else:
             spot_found = True
 
 
-def heapsort(da: DynamicArray) -> None:
+def _percolate_down_keyed(da: DynamicArray, keys: DynamicArray, node_index: int, max_index: int,
+                          on_move, arity: int) -> None:
+    """
+    percolate_down() for a node that has children, comparing the values of keys and
+    moving da's nodes along with them
+    """
+    items, offset = _unchecked(keys)
+    writable = False
+    entry = items[offset + node_index]
+
+    while True:
+        first_child_index = node_index * arity + 1
+        if first_child_index > max_index:
+            return
+
+        favorite_entry = items[offset + first_child_index]
+        fav_child_index = first_child_index
+        last_child_index = min(first_child_index + arity - 1, max_index)
+        for child_index in range(first_child_index + 1, last_child_index + 1):
+            child_entry = items[offset + child_index]
+            if child_entry < favorite_entry:
+                favorite_entry = child_entry
+                fav_child_index = child_index
+
+        if not favorite_entry < entry:
+            return
+        if not writable:
+            items, offset = _unchecked(keys, for_writing=True)
+            nodes, node_offset = _unchecked(da, for_writing=True)
+            writable = True
+        items[offset + node_index] = favorite_entry
+        items[offset + fav_child_index] = entry
+        favorite_child = nodes[node_offset + fav_child_index]
+        nodes[node_offset + fav_child_index] = nodes[node_offset + node_index]
+        nodes[node_offset + node_index] = favorite_child
+        if on_move is not None:
+            on_move(node_index, favorite_child)
+            on_move(fav_child_index, nodes[node_offset + fav_child_index])
+        node_index = fav_child_index
+
+
+def heapsort(da: DynamicArray, arity: int = 2, key=None, ascending: bool = False) -> None:
     """
-    Receives a DynamicArray and sorts it using the heap sort algorithm
+    Receives a DynamicArray and sorts it using the heap sort algorithm, on a heap
+    with the given number of children per node. If NumPy is installed and the array
+    holds only ints or only floats, it is sorted with NumPy instead (same result, but
+    arity has no effect then).
+    The array ends up in descending order, or ascending with ascending=True (not reverse=,
+    which means descending for run_sort() and merge()). If key is given, it is called once
+    per item and the items are sorted by their keys, items with equal keys keeping their
+    original order.
     """
+    if arity < 2:
+        raise MinHeapException
 
     # Handle empty array edge case
     if da.is_empty():
         return
 
-    # Time to build a heap out of the array. Start at first non-leaf node, percolate down
-    last_node_index = da.length() - 1
-    node_index = (last_node_index - 1) // 2
+    keys = None
+    if key is not None:
+        # (key, position) pairs, so equal keys are never decided by comparing the items.
+        # Positions count down so the smallest pairs, which go to the back, are the last
+        # items of each group of equal keys. For ascending=True they count up instead, and
+        # reversing the array at the end puts the groups back in their original order.
+        sign = 1 if ascending else -1
+        keys = DynamicArray((key(item), sign * index) for index, item in enumerate(da))
+    elif isinstance(da, DynamicArray) and _vectorized_sort(da, descending=not ascending):
+        return
 
-    # node_index could be -1 immediately, but while loop handles this
-    while node_index >= 0:
-        percolate_down(da, node_index, da.length() - 1)
-        node_index -= 1
+    # Time to build a heap out of the array.
+    heapify(da, arity=arity, keys=keys)
 
     # heap is built! Now perform the repeated switcharoo
 
@@ -209,10 +776,424 @@ def heapsort(da: DynamicArray) -> None:
     counter = da.length() - 1
 
     while counter > 0:
-        swap(da, 0, counter)  # swap kth element and first (smallest) element
+        # swap kth element and first (smallest) element. percolate_down() may have copied
+        # copy-on-write storage, so look the storage up again every time
+        items, offset = _unchecked(da, for_writing=True)
+        items[offset], items[offset + counter] = items[offset + counter], items[offset]
+        if keys is not None:
+            items, offset = _unchecked(keys, for_writing=True)
+            items[offset], items[offset + counter] = items[offset + counter], items[offset]
         # decrement k and percolate replacement value down. don't percolate past heap portion of the array!
         counter -= 1
-        percolate_down(da, 0, counter)
+        percolate_down(da, 0, counter, arity=arity, keys=keys)
+
+    if ascending:
+        _reverse(da)
+
+
+def _reverse(da: DynamicArray) -> None:
+    """
+    Reverses a dynamic array in place
+    """
+    items, offset = _unchecked(da, for_writing=True)
+    low, high = offset, offset + da.length() - 1
+    while low < high:
+        items[low], items[high] = items[high], items[low]
+        low += 1
+        high -= 1
+
+
+class _KeyedNode:
+    """
+    Heap entry that orders an item by a precomputed key, breaking ties by a unique
+    sequence number so items themselves are never compared.
+    """
+
+    def __init__(self, key, order: int, item) -> None:
+        self.key = key
+        self.order = order
+        self.item = item
+
+    def __lt__(self, other: "_KeyedNode") -> bool:
+        if self.key < other.key:
+            return True
+        if other.key < self.key:
+            return False
+        return self.order < other.order
+
+    def __le__(self, other: "_KeyedNode") -> bool:
+        return not other < self
+
+    def __repr__(self) -> str:
+        return repr(self.item)
+
+
+class _ReversedKeyedNode(_KeyedNode):
+    """
+    _KeyedNode with the ordering flipped, which turns a MinHeap into a max heap
+    """
+
+    def __lt__(self, other: "_KeyedNode") -> bool:
+        return _KeyedNode.__lt__(other, self)
+
+
+def nsmallest(k: int, iterable, key=None) -> DynamicArray:
+    """
+    Returns a new dynamic array with the k smallest items of iterable in ascending order,
+    equal items keeping their original order. Only a bounded heap of k items is kept, so
+    iterable can be a generator of any length: O(k) memory and O(n log k) time.
+    """
+    return _select(k, iterable, key, True)
+
+
+def nlargest(k: int, iterable, key=None) -> DynamicArray:
+    """
+    Returns a new dynamic array with the k largest items of iterable in descending order,
+    equal items keeping their original order. Same bounds as nsmallest().
+    """
+    return _select(k, iterable, key, False)
+
+
+def _select(k: int, iterable, key, smallest: bool) -> DynamicArray:
+    """
+    Shared implementation of nsmallest() and nlargest()
+    """
+    result = DynamicArray()
+    if k <= 0:
+        return result
+    if key is None:
+        key = _identity
+
+    if k == 1:
+        # single pass, no heap needed. Only a strictly better key replaces the current best.
+        best = best_key = None
+        found = False
+        for item in iterable:
+            item_key = key(item)
+            if not found or (item_key < best_key if smallest else best_key < item_key):
+                best, best_key, found = item, item_key, True
+        if found:
+            result.append(best)
+        return result
+
+    # nsmallest keeps a max heap of the best k so far (its root is the first to be evicted),
+    # nlargest a min heap. Sequence numbers make ties go to the earlier item either way.
+    node_class = _ReversedKeyedNode if smallest else _KeyedNode
+    sign = 1 if smallest else -1
+
+    length = _known_length(iterable)
+    if length is not None and k >= length:
+        # everything is kept, so just sort it all in place
+        nodes = DynamicArray()
+        for order, item in enumerate(iterable):
+            nodes.append(node_class(key(item), sign * order, item))
+        heapsort(nodes)
+        for i in range(nodes.length()):
+            result.append(nodes[i].item)
+        return result
+
+    heap = MinHeap()
+    iterator = iter(iterable)
+    first_nodes = DynamicArray()
+    for order, item in zip(range(k), iterator):
+        first_nodes.append(node_class(key(item), sign * order, item))
+    heap.add_many(first_nodes)
+
+    order = k
+    for item in iterator:
+        item_key = key(item)
+        worst_key = heap.get_min().key
+        # skip the allocation unless the item beats the worst one kept so far
+        if item_key < worst_key if smallest else worst_key < item_key:
+            heap.replace(node_class(item_key, sign * order, item))
+        order += 1
+
+    # the heap hands back the worst item first, so fill the result from the back
+    nodes = DynamicArray()
+    while not heap.is_empty():
+        nodes.append(heap.remove_min())
+    for i in range(nodes.length() - 1, -1, -1):
+        result.append(nodes[i].item)
+    return result
+
+
+def merge(*sorted_arrays, key=None, reverse: bool = False):
+    """
+    Generator that lazily merges several sorted dynamic arrays into one sorted stream, in
+    O(N log k) for N items in k arrays and with only one heap entry per array in memory.
+    Equal items come out in the order of the arrays they came from. With reverse=True the
+    arrays must be sorted in descending order (which is what heapsort() produces) and the
+    output is descending as well. The arrays must not be modified during the merge.
+    """
+    if key is None:
+        key = _identity
+    node_class = _ReversedKeyedNode if reverse else _KeyedNode
+    # the sequence number of each entry is its array number, negated for a reversed merge
+    # so ties still go to the earlier array
+    sign = -1 if reverse else 1
+
+    next_indices = DynamicArray()  # next unread index of every array
+    first_nodes = DynamicArray()
+    for array_number in range(len(sorted_arrays)):
+        arr = sorted_arrays[array_number]
+        if not arr.is_empty():
+            first_nodes.append(node_class(key(arr[0]), sign * array_number, arr[0]))
+        next_indices.append(1)
+    heap = MinHeap()
+    heap.add_many(first_nodes)
+
+    while not heap.is_empty():
+        node = heap.get_min()
+        item = node.item
+        array_number = sign * node.order
+        arr = sorted_arrays[array_number]
+        next_index = next_indices[array_number]
+        if next_index < arr.length():
+            # reuse the root entry for the next item of the same array
+            next_indices[array_number] = next_index + 1
+            node.item = arr[next_index]
+            node.key = key(node.item)
+            heap.replace(node)
+        else:
+            heap.remove_min()
+        yield item
+
+
+# run_sort() extends shorter runs to this length with binary insertion sort before merging
+MIN_RUN = 32
+# number of consecutive wins from the same run after which run_sort() starts galloping
+MIN_GALLOP = 7
+
+
+def run_sort(da: DynamicArray, reverse: bool = False) -> None:
+    """
+    Stable, adaptive sort of a dynamic array in place, in ascending order (descending with
+    reverse=True, equal items still keeping their original order). Splits the array into
+    runs the same way chunk() does, reversing strictly descending runs in place, then merges
+    neighbouring runs with galloping. Sorted and reversed input takes O(n). Runs shorter than
+    MIN_RUN are extended with binary insertion sort first, so random input is merged from
+    runs that are worth merging.
+    """
+    less = _greater if reverse else _less
+    length = da.length()
+    if length < 2:
+        return
+
+    # run_starts holds the first index of every run, followed by the length of the array
+    run_starts = DynamicArray()
+    start = 0
+    while start < length:
+        run_starts.append(start)
+        end = _next_run(da, start, length, less)
+        if end - start < MIN_RUN:
+            forced_end = min(start + MIN_RUN, length)
+            _insertion_sort(da, start, end, forced_end, less)
+            end = forced_end
+        start = end
+    run_starts.append(length)
+
+    # merge neighbouring runs pairwise until a single run is left
+    while run_starts.length() > 2:
+        merged_starts = DynamicArray()
+        for i in range(0, run_starts.length() - 2, 2):
+            merged_starts.append(run_starts[i])
+            _merge_runs(da, run_starts[i], run_starts[i + 1], run_starts[i + 2], less)
+        if run_starts.length() % 2 == 0:
+            merged_starts.append(run_starts[run_starts.length() - 2])  # odd run out
+        merged_starts.append(length)
+        run_starts = merged_starts
+
+
+def _less(a: object, b: object) -> bool:
+    return a < b
+
+
+def _greater(a: object, b: object) -> bool:
+    return b < a
+
+
+def _next_run(da: DynamicArray, start: int, length: int, less) -> int:
+    """
+    Finds the run that begins at start and returns the index right after it. A strictly
+    descending run is reversed in place (strictly, so equal items never swap places).
+    """
+    end = start + 1
+    if end == length:
+        return end
+    if less(da[end], da[start]):
+        while end < length and less(da[end], da[end - 1]):
+            end += 1
+        low, high = start, end - 1
+        while low < high:
+            swap(da, low, high)
+            low += 1
+            high -= 1
+    else:
+        while end < length and not less(da[end], da[end - 1]):
+            end += 1
+    return end
+
+
+def _insertion_sort(da: DynamicArray, start: int, sorted_end: int, end: int, less) -> None:
+    """
+    Extends the sorted range da[start:sorted_end] to da[start:end] by binary insertion,
+    placing each item after any equal ones
+    """
+    for i in range(sorted_end, end):
+        pivot = da[i]
+        low, high = start, i
+        while low < high:
+            middle = (low + high) // 2
+            if less(pivot, da[middle]):
+                high = middle
+            else:
+                low = middle + 1
+        for j in range(i, low, -1):
+            da[j] = da[j - 1]
+        da[low] = pivot
+
+
+def _merge_runs(da: DynamicArray, low: int, middle: int, high: int, less) -> None:
+    """
+    Merges the sorted runs da[low:middle] and da[middle:high] in place. The left run is
+    copied out to a temporary StaticArray. Once one run wins MIN_GALLOP times in a row,
+    the whole block it wins is found with a galloping search and moved at once.
+    """
+    # already in order, e.g. runs of nearly sorted data
+    if not less(da[middle], da[middle - 1]):
+        return
+
+    left_length = middle - low
+    left = StaticArray(left_length)
+    for i in range(left_length):
+        left[i] = da[low + i]
+
+    i, j, k = 0, middle, low  # next item of the left run, of the right run, next slot to fill
+    left_wins = right_wins = 0
+    while i < left_length and j < high:
+        if less(da[j], left[i]):
+            # right item goes first only if strictly smaller, which keeps the merge stable
+            da[k] = da[j]
+            j += 1
+            k += 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= MIN_GALLOP:
+                pivot = left[i]
+                stop = _gallop(da, j, high, lambda item: less(item, pivot))
+                while j < stop:
+                    da[k] = da[j]
+                    j += 1
+                    k += 1
+                right_wins = 0
+        else:
+            da[k] = left[i]
+            i += 1
+            k += 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= MIN_GALLOP and j < high:
+                pivot = da[j]
+                stop = _gallop(left, i, left_length, lambda item: not less(pivot, item))
+                while i < stop:
+                    da[k] = left[i]
+                    i += 1
+                    k += 1
+                left_wins = 0
+
+    # whatever is left of the right run is already in place
+    while i < left_length:
+        da[k] = left[i]
+        i += 1
+        k += 1
+
+
+def _gallop(arr, start: int, stop: int, goes_first) -> int:
+    """
+    Returns the first index in [start, stop) whose item doesn't satisfy goes_first, given
+    that goes_first is True for a prefix of that range and False afterwards. Probes at
+    exponentially growing offsets, then binary searches the last gap.
+    """
+    low = start  # everything before low is known to go first
+    offset = 1
+    while start + offset - 1 < stop and goes_first(arr[start + offset - 1]):
+        low = start + offset
+        offset *= 2
+    high = min(start + offset - 1, stop)
+
+    while low < high:
+        middle = (low + high) // 2
+        if goes_first(arr[middle]):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+# parallel_sort() sorts arrays shorter than this in the calling process, since below it
+# pickling the partitions costs more than the extra cores save
+PARALLEL_SORT_CUTOFF = 50_000
+
+
+def parallel_sort(da: DynamicArray, workers: int = None, reverse: bool = False) -> None:
+    """
+    Sorts a dynamic array in place like run_sort(), but splits it into one contiguous
+    partition per worker process, sorts the partitions in a process pool, and merges them
+    back with merge(). workers defaults to the number of CPUs. Arrays shorter than
+    PARALLEL_SORT_CUTOFF, or a single worker, are sorted serially. Items must be picklable.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    length = da.length()
+    if workers < 2 or length < PARALLEL_SORT_CUTOFF:
+        run_sort(da, reverse)
+        return
+
+    partition_size = -(-length // workers)  # ceiling division
+    partitions = DynamicArray()
+    for start in range(0, length, partition_size):
+        partitions.append(da.slice(start, min(partition_size, length - start)))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        sorted_partitions = list(pool.map(_sort_partition, partitions, repeat(reverse)))
+
+    # merge() gives ties to earlier partitions, so the result is stable like run_sort()
+    index = 0
+    for item in merge(*sorted_partitions, reverse=reverse):
+        da[index] = item
+        index += 1
+
+
+def _sort_partition(da: DynamicArray, reverse: bool) -> DynamicArray:
+    """
+    Worker process side of parallel_sort()
+    """
+    run_sort(da, reverse)
+    return da
+
+
+def most_frequent(values, k: int) -> DynamicArray:
+    """
+    Returns a dynamic array with the k most frequent (value, count) pairs of a dynamic array or
+    any iterable, most frequent first and ties in order of first occurrence. Counting is a
+    single hash-based pass, then a bounded heap of k entries picks the winners.
+    """
+    counts = count_frequencies(values)
+    return nlargest(k, counts.items(), key=_count_of)
+
+
+def _count_of(pair: tuple) -> int:
+    """
+    Key function for most_frequent()
+    """
+    return pair[1]
+
+
+def _identity(value: object) -> object:
+    """
+    Default key function
+    """
+    return value
 
 
 def swap(da: DynamicArray, index1: int, index2: int) -> None:
@@ -269,6 +1250,92 @@ if __name__ == '__main__':
         print(h, end=' ')
         print(h.remove_min())
 
+    print("\nadd_many example 1")
+    print("------------------")
+    h = MinHeap([30, 10, 20])
+    print(h)
+    h.add_many([5])
+    print(h)
+    h.add_many(range(15, 0, -1))
+    print(h)
+    h.add_many([])
+    print(h, h.size())
+
+    print("\npushpop / replace example 1")
+    print("---------------------------")
+    h = MinHeap([5, 7, 9])
+    print(h.pushpop(3), h)
+    print(h.pushpop(8), h)
+    print(h.replace(1), h)
+    print(h.replace(10), h, h.size())
+    try:
+        MinHeap().replace(1)
+    except MinHeapException as e:
+        print("Exception raised:", type(e))
+
+    print("\ntyped heap example 1")
+    print("--------------------")
+    h = MinHeap([3.0, 1.0, 2.0], typecode='d')
+    h.add(0.5)
+    print(h)
+    print(h.remove_min(), h.pushpop(5.0))
+    print(h)
+    h.build_heap(DynamicArray([9, 8, 7], typecode='q'))
+    print(h)
+
+    print("\nd-ary heap example 1")
+    print("--------------------")
+    for arity in [2, 3, 4]:
+        h = MinHeap(range(10, 0, -1), arity)
+        print(arity, h, h.remove_min(), h.remove_min(), h)
+
+    print("\nIndexedMinHeap example 1")
+    print("------------------------")
+    h = IndexedMinHeap([('a', 5), ('b', 3), ('c', 8)])
+    print(h, h.contains('a'), h.contains('z'))
+    h.add('d', 1)
+    h.decrease_key('c', 0)
+    h.increase_key('d', 9)
+    print(h, h.get_min())
+    h.update('b', 10)
+    print(h.remove('a'), h)
+    print(h.pushpop('e', 4), h.replace('f', 20), h)
+    while not h.is_empty():
+        print(h.remove_min(), end=' ')
+    print()
+    try:
+        h.decrease_key('a', 1)
+    except MinHeapException as e:
+        print("Exception raised:", type(e))
+
+    print("\ndiscard example 1")
+    print("-----------------")
+    h = MinHeap([5, 1, 4, 1, 3, 9, 2, 6], compact_threshold=0.4)
+    h.discard(1)
+    h.discard(4)
+    print(h.size(), h.get_min(), h.get_tombstone_stats())
+    h.discard(9)
+    print(h, h.get_tombstone_stats())
+    h.discard(1)
+    print(h, h.get_tombstone_stats())
+    while not h.is_empty():
+        print(h.remove_min(), end=' ')
+    print()
+    try:
+        h.discard(7)
+    except MinHeapException as e:
+        print("Exception raised:", type(e))
+
+    print("\nkey example 1")
+    print("-------------")
+    h = MinHeap([('write', 3), ('read', 1), ('sync', 3), ('open', 0)], key=lambda task: task[1])
+    h.add(('close', 1))
+    print(h, h.get_min())
+    print(h.pushpop(('stat', 1)), h.replace(('seek', 2)))
+    while not h.is_empty():
+        print(h.remove_min(), end=' ')
+    print()
+
     print("\nPDF - build_heap example 1")
     print("--------------------------")
     da = DynamicArray([100, 20, 6, 200, 90, 150, 300])
@@ -325,3 +1392,82 @@ if __name__ == '__main__':
     print(f"Before: {da}")
     heapsort(da)
     print(f"After:  {da}")
+
+    print("\nheapsort example 3")
+    print("------------------")
+    for arity in [2, 4, 8]:
+        da = DynamicArray([100, 20, 6, 200, 90, 150, 300, 6, 45, 12])
+        heapsort(da, arity)
+        print(f"arity {arity}: {da}")
+
+    print("\nnsmallest / nlargest example 1")
+    print("------------------------------")
+    values = [5, 1, 8, 3, 9, 2, 8, 7]
+    for k in [0, 1, 3, 8, 20]:
+        print(k, nsmallest(k, values), nlargest(k, values))
+    words = (word for word in "the quick brown fox jumps over the lazy dog".split())
+    print(nsmallest(3, words, key=len))
+    words = (word for word in "the quick brown fox jumps over the lazy dog".split())
+    print(nlargest(3, words, key=len))
+
+    print("\nmerge example 1")
+    print("---------------")
+    shards = [DynamicArray([1, 4, 7, 10]), DynamicArray(), DynamicArray([2, 4, 8]), DynamicArray([0, 11])]
+    print(list(merge(*shards)))
+    print(list(merge()))
+    words = [DynamicArray(['fig', 'apple']), DynamicArray(['kiwi', 'melon', 'banana'])]
+    print(list(merge(*words, key=len)))
+    shards = [DynamicArray([5, 9, 1]), DynamicArray([6, 3, 2])]
+    for shard in shards:
+        heapsort(shard)
+    print(list(merge(*shards, reverse=True)))
+
+    print("\nrun_sort example 1")
+    print("------------------")
+    test_cases = (
+        [1, 2, 3, 4, 5, 6],
+        [6, 5, 4, 3, 2, 1],
+        [1, 2, 3, 10, 9, 8, 4, 5, 6, 7, 20, 30, 11, 12],
+        [5, 1, 4, 2, 3],
+        ['monkey', 'zebra', 'elephant', 'horse', 'bear']
+    )
+    for case in test_cases:
+        da = DynamicArray(case)
+        run_sort(da)
+        print(da)
+    da = DynamicArray([1, 2, 3, 10, 9, 8, 4, 5, 6, 7, 20, 30, 11, 12])
+    run_sort(da, reverse=True)
+    print(da)
+
+    print("\nparallel_sort example 1")
+    print("-----------------------")
+    da = DynamicArray([5, 3, 9, 1, 7])
+    parallel_sort(da, workers=4)
+    print(da)
+    da = DynamicArray((i * 7919) % 50_000 for i in range(50_000))
+    parallel_sort(da, workers=3)
+    print(da.slice(0, 5), da.slice(da.length() - 5, 5))
+
+    print("\nmost_frequent example 1")
+    print("-----------------------")
+    da = DynamicArray([4, 1, 2, 4, 3, 2, 4, 5, 2, 1])
+    for k in [0, 1, 2, 10]:
+        print(k, most_frequent(da, k))
+
+    print("\nheapsort on a view example 1")
+    print("----------------------------")
+    da = DynamicArray([100, 20, 6, 200, 90, 150, 300])
+    heapsort(da.view(1, 5))
+    print(da)
+
+    print("\nheapsort with key example 1")
+    print("---------------------------")
+    words = ['pear', 'fig', 'apple', 'kiwi', 'plum', 'banana', 'date']
+    da = DynamicArray(words)
+    heapsort(da, key=len)
+    print(da)
+    heapsort(da, key=len, ascending=True)
+    print(da)
+    da = DynamicArray([5, 3, 9, 1, 7])
+    heapsort(da, ascending=True)
+    print(da)
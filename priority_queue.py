@@ -0,0 +1,204 @@
+# Course:       CS261 - Data Structures
+# Description:  Thread-safe blocking priority queue on top of MinHeap, for feeding a
+#               heap from several producer threads and draining it from a pool of
+#               worker threads without polling.
+
+
+import threading
+
+from min_heap import *
+
+
+class PriorityQueueException(Exception):
+    """
+    Custom exception to be used by BlockingPriorityQueue
+    """
+    pass
+
+
+class PriorityQueueEmpty(PriorityQueueException):
+    """
+    Raised by get() without waiting, or after its timeout, when the queue is empty
+    """
+    pass
+
+
+class PriorityQueueFull(PriorityQueueException):
+    """
+    Raised by put() without waiting, or after its timeout, when a bounded queue is full
+    """
+    pass
+
+
+class BlockingPriorityQueue:
+    """
+    MinHeap shared between threads. get() hands out the smallest node, waiting for one
+    to be put if the queue is empty. With a maxsize above 0 the queue is bounded and
+    put() waits for room, which slows producers down to the pace of the consumers.
+    Every method takes one lock, so get_many() hands out a whole batch for the price
+    of one get().
+    """
+
+    def __init__(self, maxsize: int = 0, arity: int = 2) -> None:
+        if maxsize < 0:
+            raise PriorityQueueException
+        self._maxsize = maxsize
+        self._heap = MinHeap(arity=arity)
+        self._lock = threading.Lock()
+        # both conditions share the lock, so waiting on either releases it
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __str__(self) -> str:
+        """
+        Return content of the queue in human-readable form
+        """
+        with self._lock:
+            return "QUEUE " + str(self._heap)[len("HEAP "):]
+
+    def put(self, node: object, block: bool = True, timeout: float = None) -> None:
+        """
+        Adds a node. If the queue is full, waits until there is room, for at most timeout
+        seconds if given, then raises PriorityQueueFull. With block=False it raises right away.
+        """
+        with self._not_full:
+            if self._maxsize > 0 and self._heap.size() >= self._maxsize:
+                if not block or not self._not_full.wait_for(self._has_room, timeout):
+                    raise PriorityQueueFull
+            self._heap.add(node)
+            self._not_empty.notify()
+
+    def put_nowait(self, node: object) -> None:
+        """
+        Adds a node, raising PriorityQueueFull if the queue is full
+        """
+        self.put(node, block=False)
+
+    def get(self, block: bool = True, timeout: float = None) -> object:
+        """
+        Removes and returns the smallest node. If the queue is empty, waits until a node is
+        put, for at most timeout seconds if given, then raises PriorityQueueEmpty. With
+        block=False it raises right away.
+        """
+        with self._not_empty:
+            if self._heap.is_empty():
+                if not block or not self._not_empty.wait_for(self._has_nodes, timeout):
+                    raise PriorityQueueEmpty
+            node = self._heap.remove_min()
+            self._not_full.notify()
+            return node
+
+    def get_nowait(self) -> object:
+        """
+        Removes and returns the smallest node, raising PriorityQueueEmpty if the queue is empty
+        """
+        return self.get(block=False)
+
+    def get_many(self, n: int, block: bool = True, timeout: float = None) -> DynamicArray:
+        """
+        Removes and returns up to n of the smallest nodes, smallest first, under one lock
+        acquisition. Waits like get() while the queue is empty, then returns whatever is
+        there without waiting for all n.
+        """
+        if n < 1:
+            raise PriorityQueueException
+        with self._not_empty:
+            if self._heap.is_empty():
+                if not block or not self._not_empty.wait_for(self._has_nodes, timeout):
+                    raise PriorityQueueEmpty
+            nodes = DynamicArray()
+            while nodes.length() < n and not self._heap.is_empty():
+                nodes.append(self._heap.remove_min())
+            self._not_full.notify(nodes.length())
+            return nodes
+
+    def qsize(self) -> int:
+        """
+        Returns the number of nodes in the queue. Other threads can change it right after.
+        """
+        with self._lock:
+            return self._heap.size()
+
+    def empty(self) -> bool:
+        """
+        Returns True if the queue is empty at the moment
+        """
+        with self._lock:
+            return self._heap.is_empty()
+
+    def full(self) -> bool:
+        """
+        Returns True if the queue is bounded and full at the moment
+        """
+        with self._lock:
+            return not self._has_room()
+
+    def get_maxsize(self) -> int:
+        """
+        Returns the capacity of the queue, 0 if it is unbounded
+        """
+        return self._maxsize
+
+    def _has_room(self) -> bool:
+        return self._maxsize == 0 or self._heap.size() < self._maxsize
+
+    def _has_nodes(self) -> bool:
+        return not self._heap.is_empty()
+
+
+if __name__ == '__main__':
+
+    print("\nBlockingPriorityQueue example 1")
+    print("-------------------------------")
+    q = BlockingPriorityQueue()
+    for value in [5, 1, 4, 2, 3]:
+        q.put(value)
+    print(q, q.qsize())
+    print(q.get(), q.get_nowait(), q.get_many(2), q.qsize())
+    print(q.get_many(10), q.empty())
+    try:
+        q.get(timeout=0.01)
+    except PriorityQueueEmpty:
+        print("empty after waiting 0.01 seconds")
+
+    print("\nBlockingPriorityQueue example 2")
+    print("-------------------------------")
+    q = BlockingPriorityQueue(maxsize=2)
+    q.put((2, 'b'))
+    q.put((1, 'a'))
+    print(q.full())
+    try:
+        q.put_nowait((0, 'z'))
+    except PriorityQueueFull:
+        print("full")
+
+    # a consumer thread makes room for the producer below
+    consumer = threading.Thread(target=lambda: print("consumed", q.get()))
+    consumer.start()
+    q.put((3, 'c'), timeout=5)
+    consumer.join()
+    print(q)
+
+    print("\nBlockingPriorityQueue example 3")
+    print("-------------------------------")
+    q = BlockingPriorityQueue(maxsize=10)
+    results = DynamicArray()
+    results_lock = threading.Lock()
+
+    def produce(start):
+        for value in range(start, 1000, 4):
+            q.put(value)
+
+    def consume():
+        for _ in range(250):
+            value = q.get()
+            with results_lock:
+                results.append(value)
+
+    threads = [threading.Thread(target=produce, args=(i,)) for i in range(4)]
+    threads += [threading.Thread(target=consume) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(results.length(), sorted(results) == list(range(1000)), q.empty())
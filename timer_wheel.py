@@ -0,0 +1,205 @@
+# Course:       CS261 - Data Structures
+# Description:  Hierarchical timing wheel for large numbers of timeouts, most of which
+#               are cancelled before they fire. Timers are bucketed by deadline into
+#               rings of slots, so scheduling and cancelling are O(1), and only
+#               deadlines beyond the last ring go into a MinHeap.
+
+
+from min_heap import *
+
+
+class TimerWheelException(Exception):
+    """
+    Custom exception to be used by TimerWheel
+    """
+    pass
+
+
+class WheelTimer:
+    """
+    A timer scheduled with TimerWheel. value is whatever was passed to schedule().
+    """
+
+    def __init__(self, deadline: int, value: object) -> None:
+        self.deadline = deadline
+        self.value = value
+        self._slot = None  # DynamicArray of the wheel slot holding the timer, None in the heap
+        self._index = 0  # position in that slot
+        self._pending = True  # False once expired or cancelled
+
+    def is_pending(self) -> bool:
+        """
+        Return True if the timer has neither expired nor been cancelled
+        """
+        return self._pending
+
+
+class TimerWheel:
+    """
+    Timers keyed by integer deadlines (ticks) on a hierarchy of wheels. Level 0 has one
+    slot per tick for the next `slots` ticks, and each level above has slots covering a
+    whole turn of the level below, so `levels` levels reach slots ** levels ticks ahead.
+    Timers further out wait in a MinHeap until they come within reach.
+
+    schedule() drops a timer into its slot and cancel() swaps it out of its slot, both O(1).
+    advance() moves time forward one tick at a time, and whenever a level completes a turn
+    the next slot of the level above is emptied into the levels below (a cascade), so every
+    timer is moved at most levels times before it expires. Cancelled timers in the heap are
+    only marked, and dropped when they come within reach.
+    """
+
+    def __init__(self, slots: int = 256, levels: int = 4, start: int = 0) -> None:
+        # slots has to be a power of two so slot numbers can be taken from the deadline's bits
+        if slots < 2 or slots & (slots - 1) or levels < 1:
+            raise TimerWheelException
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels = levels
+        self._span = slots ** levels  # timers at least this far out go into the heap
+        self._now = start
+        self._wheels = DynamicArray()
+        for _ in range(levels):
+            wheel = DynamicArray()
+            for _ in range(slots):
+                wheel.append(DynamicArray())
+            self._wheels.append(wheel)
+        self._overflow = MinHeap()  # (deadline, order, timer) for timers beyond the wheels
+        self._order = 0  # breaks ties between heap entries, so timers are never compared
+        self._size = 0  # pending timers
+
+    def get_time(self) -> int:
+        """
+        Return the current tick
+        """
+        return self._now
+
+    def size(self) -> int:
+        """
+        Return the number of pending timers
+        """
+        return self._size
+
+    def schedule(self, deadline: int, value: object = None) -> WheelTimer:
+        """
+        Schedules a timer for the given tick and returns it. A deadline that isn't after the
+        current tick expires on the next one.
+        """
+        timer = WheelTimer(max(deadline, self._now + 1), value)
+        self._place(timer)
+        self._size += 1
+        return timer
+
+    def schedule_after(self, delay: int, value: object = None) -> WheelTimer:
+        """
+        Schedules a timer delay ticks from now and returns it
+        """
+        return self.schedule(self._now + delay, value)
+
+    def cancel(self, timer: WheelTimer) -> bool:
+        """
+        Cancels a pending timer. Returns False if it had already expired or been cancelled.
+        """
+        if not timer._pending:
+            return False
+        timer._pending = False
+        self._size -= 1
+        if timer._slot is not None:
+            _take_out(timer)
+        return True
+
+    def advance(self, ticks: int = 1) -> DynamicArray:
+        """
+        Moves time forward by ticks and returns the timers that expired, by deadline
+        (timers with the same deadline in no particular order)
+        """
+        if ticks < 0:
+            raise TimerWheelException
+        expired = DynamicArray()
+        for _ in range(ticks):
+            self._tick(expired)
+        return expired
+
+    def advance_to(self, tick: int) -> DynamicArray:
+        """
+        Moves time forward to the given tick and returns the timers that expired
+        """
+        return self.advance(max(0, tick - self._now))
+
+    def _tick(self, expired: DynamicArray) -> None:
+        """
+        Moves time forward one tick, adding the timers that expire to expired
+        """
+        self._now += 1
+        now = self._now
+
+        # pull timers that came within reach out of the heap
+        while not self._overflow.is_empty() and self._overflow.get_min()[0] - now < self._span:
+            timer = self._overflow.remove_min()[2]
+            if timer._pending:
+                self._place(timer)
+
+        # find the highest level that completes a turn, then cascade from there down so
+        # timers from one level can still be cascaded further by the levels below it
+        level = 0
+        while level < self._levels - 1 and (now >> (self._bits * level)) & self._mask == 0:
+            level += 1
+        while level > 0:
+            slot = self._wheels[level][(now >> (self._bits * level)) & self._mask]
+            while not slot.is_empty():
+                timer = slot.pop()
+                timer._slot = None
+                self._place(timer)
+            level -= 1
+
+        slot = self._wheels[0][now & self._mask]
+        while not slot.is_empty():
+            timer = slot.pop()
+            timer._slot = None
+            timer._pending = False
+            self._size -= 1
+            expired.append(timer)
+
+    def _place(self, timer: WheelTimer) -> None:
+        """
+        Puts a timer in the slot for its deadline, or in the heap if it is out of reach
+        """
+        delta = timer.deadline - self._now
+        if delta >= self._span:
+            self._overflow.add((timer.deadline, self._order, timer))
+            self._order += 1
+            return
+        # the lowest level whose turn reaches the deadline
+        level = 0
+        while delta >= 1 << (self._bits * (level + 1)):
+            level += 1
+        slot = self._wheels[level][(timer.deadline >> (self._bits * level)) & self._mask]
+        timer._slot = slot
+        timer._index = slot.length()
+        slot.append(timer)
+
+
+def _take_out(timer: WheelTimer) -> None:
+    """
+    Removes a timer from its slot in O(1) by moving the slot's last timer into its place
+    """
+    slot = timer._slot
+    last = slot.pop()
+    if last is not timer:
+        slot[timer._index] = last
+        last._index = timer._index
+    timer._slot = None
+
+
+if __name__ == '__main__':
+
+    print("\nTimerWheel example 1")
+    print("--------------------")
+    wheel = TimerWheel(slots=4, levels=2)
+    timers = DynamicArray()
+    for deadline in [3, 1, 20, 6, 2, 17, 40]:
+        timers.append(wheel.schedule(deadline, f"t{deadline}"))
+    print(wheel.size(), wheel.cancel(timers[3]), wheel.cancel(timers[3]), wheel.size())
+    for _ in range(5):
+        expired = wheel.advance(9)
+        print(wheel.get_time(), [timer.value for timer in expired])
+    print(wheel.size(), timers[0].is_pending())